@@ -0,0 +1,256 @@
+"""
+Analytics - Write-behind event log
+Records per-puzzle outcomes without putting disk writes on the request path.
+
+Events go into a bounded in-memory queue and a background thread flushes
+them in batches to gzip-compressed, append-only JSON-lines segment files.
+Segments rotate once they reach a size limit. Each batch is written as its
+own gzip member, so a segment stays readable even if the process dies
+mid-write.
+
+Segments go to data/events/ unless SEQUENCE_MASTER_EVENTS_DIR points
+elsewhere (the tests use it to keep fake traffic out of real analytics).
+
+Usage:
+    python analytics.py aggregate [--dir DIR] [--by rule_set,level,mode]
+"""
+import argparse
+import atexit
+import gzip
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+EVENTS_DIR_ENV = 'SEQUENCE_MASTER_EVENTS_DIR'
+DEFAULT_LOG_DIR = os.path.join(os.path.dirname(__file__), 'data', 'events')
+SEGMENT_PREFIX = 'events-'
+SEGMENT_SUFFIX = '.jsonl.gz'
+
+
+def default_log_dir():
+    """SEQUENCE_MASTER_EVENTS_DIR if set, else data/events (read at call time)"""
+    return os.environ.get(EVENTS_DIR_ENV) or DEFAULT_LOG_DIR
+
+
+class EventLog:
+    """Bounded write-behind queue flushed to rotating segment files"""
+
+    def __init__(self, log_dir=None, max_queue=10000, batch_size=500,
+                 flush_interval=1.0, segment_max_bytes=8 * 1024 * 1024):
+        self.log_dir = log_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.segment_max_bytes = segment_max_bytes
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._segment_path = None
+        self._segment_index = 0
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+
+    def start(self):
+        """Start the background flusher thread (idempotent)"""
+        with self._lock:
+            if self.log_dir is None:
+                self.log_dir = default_log_dir()
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='event-log-flusher', daemon=True)
+            self._thread.start()
+        return self
+
+    def record(self, event_type, **fields):
+        """Queue an event; never blocks. Returns False if the event was dropped."""
+        event = {'type': event_type, 'ts': round(time.time(), 3)}
+        event.update(fields)
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.recorded += 1
+        return True
+
+    def stats(self):
+        """Counters for monitoring backpressure"""
+        with self._lock:
+            return {
+                'recorded': self.recorded,
+                'dropped': self.dropped,
+                'written': self.written,
+                'queued': self._queue.qsize(),
+                'segment': os.path.basename(self._segment_path) if self._segment_path else None
+            }
+
+    def close(self, timeout=5.0):
+        """Stop the flusher and write out everything still queued"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        # Drain whatever the thread did not get to (or everything, if never started)
+        batch = self._drain()
+        while batch:
+            self._flush(batch)
+            batch = self._drain()
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._drain(block=True)
+            if batch:
+                self._flush(batch)
+
+    def _drain(self, block=False):
+        """Collect up to batch_size events, waiting at most flush_interval for the first"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                if block:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        payload = ''.join(json.dumps(e, separators=(',', ':')) + '\n' for e in batch)
+        try:
+            with self._flush_lock:
+                path = self._current_segment()
+                # Append as a new gzip member; concatenated members read back as one stream
+                with gzip.open(path, 'ab') as f:
+                    f.write(payload.encode('utf-8'))
+        except OSError as e:
+            print(f"Event log flush failed: {e}", file=sys.stderr)
+            with self._lock:
+                self.dropped += len(batch)
+            return
+        with self._lock:
+            self.written += len(batch)
+
+    def _current_segment(self):
+        """Return the active segment path, rotating when it grows past the limit"""
+        if self._segment_path is not None:
+            try:
+                if os.path.getsize(self._segment_path) < self.segment_max_bytes:
+                    return self._segment_path
+            except OSError:
+                pass
+        if self.log_dir is None:
+            self.log_dir = default_log_dir()
+        os.makedirs(self.log_dir, exist_ok=True)
+        while True:
+            self._segment_index += 1
+            name = f"{SEGMENT_PREFIX}{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._segment_index:04d}{SEGMENT_SUFFIX}"
+            path = os.path.join(self.log_dir, name)
+            if not os.path.exists(path):
+                self._segment_path = path
+                return path
+
+
+def iter_segments(log_dir=None):
+    """Yield segment paths in name (i.e. creation) order"""
+    log_dir = log_dir or default_log_dir()
+    try:
+        names = sorted(os.listdir(log_dir))
+    except FileNotFoundError:
+        return
+    for name in names:
+        if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+            yield os.path.join(log_dir, name)
+
+
+def iter_events(log_dir=None):
+    """Stream events one line at a time across all segments"""
+    for path in iter_segments(log_dir):
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        except (OSError, EOFError):
+            # A truncated tail member from a crash; keep what was readable
+            continue
+
+
+def aggregate(events, group_by=('rule_set', 'level', 'mode')):
+    """Fold answer events into per-group counters. Memory is bounded by the number of groups."""
+    groups = {}
+    for event in events:
+        if event.get('type') != 'answer':
+            continue
+        key = tuple(event.get(field) for field in group_by)
+        g = groups.get(key)
+        if g is None:
+            g = groups[key] = {'attempts': 0, 'correct': 0, 'time_total': 0.0,
+                               'time_min': None, 'time_max': None}
+        g['attempts'] += 1
+        if event.get('correct'):
+            g['correct'] += 1
+        t = event.get('time_taken')
+        if isinstance(t, (int, float)):
+            g['time_total'] += t
+            g['time_min'] = t if g['time_min'] is None else min(g['time_min'], t)
+            g['time_max'] = t if g['time_max'] is None else max(g['time_max'], t)
+
+    rows = []
+    for key, g in groups.items():
+        row = dict(zip(group_by, key))
+        row['attempts'] = g['attempts']
+        row['accuracy'] = round(g['correct'] / g['attempts'], 4)
+        row['avg_time'] = round(g['time_total'] / g['attempts'], 3)
+        row['min_time'] = g['time_min']
+        row['max_time'] = g['time_max']
+        rows.append(row)
+    rows.sort(key=lambda r: tuple(_sort_key(r[f]) for f in group_by))
+    return rows
+
+
+def _sort_key(value):
+    """Order values naturally (level 2 before 10); None last, mixed types grouped by type"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (False, 'number', value)
+    return (value is None, type(value).__name__, value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sequence Master analytics tools')
+    sub = parser.add_subparsers(dest='command', required=True)
+    agg = sub.add_parser('aggregate', help='Stream all segments and print per-group outcome stats')
+    agg.add_argument('--dir', default=None, help=f'Segment directory (default: ${EVENTS_DIR_ENV} or data/events)')
+    agg.add_argument('--by', default='rule_set,level,mode',
+                     help='Comma-separated event fields to group by')
+    args = parser.parse_args(argv)
+
+    group_by = tuple(f.strip() for f in args.by.split(',') if f.strip())
+    for row in aggregate(iter_events(args.dir), group_by):
+        print(json.dumps(row))
+    return 0
+
+
+# Shared process-wide log used by the web app
+event_log = EventLog()
+atexit.register(event_log.close)
+
+if __name__ == '__main__':
+    sys.exit(main())
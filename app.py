@@ -1,10 +1,18 @@
-from flask import Flask, render_template, jsonify, request, session
-from sequenceMaster import SequenceMasterV2
+from flask import Flask, render_template, jsonify, request, session, g
+from sequenceMaster import SequenceMasterV2, build_puzzle
 from codeBreakerPatterns import CodeBreakerPatterns
+from analytics import event_log
+from leaderboardIndex import LeaderboardIndex, ALL_MODES
+from challengeTokens import issue_token, verify_token, derive_seed, new_nonce, InvalidToken
+import memoryStats
+from solveStats import WorkerSolveStats
 from datetime import datetime, timedelta
+from functools import lru_cache
 import json
 import os
 import hashlib
+import atexit
+import random
 
 app = Flask(__name__)
 # Use environment variable in production, fallback to dev key for local development
@@ -20,6 +28,32 @@ CONFIG = load_config()
 GAME_MODES = CONFIG['game_modes']
 ACHIEVEMENTS = CONFIG['achievements']
 
+# Per-puzzle outcomes are logged write-behind so /api/answer never touches disk
+event_log.start()
+
+# Population-wide solve times per rule; snapshots are merged across workers
+solve_stats = WorkerSolveStats().start()
+atexit.register(solve_stats.close)
+RULE_NAMES = {rule: data['name'] for rule, data in CONFIG.get('patterns', {}).items()}
+BOSS_STATS_MODE = 'boss'
+BOSS_TIME_LIMIT = 30
+
+# Opt-in allocation tracing (SEQUENCE_MASTER_TRACEMALLOC=1)
+if memoryStats.requested():
+    memoryStats.start()
+MEMORY_TRACKED_ENDPOINTS = {'get_challenge', 'check_answer'}
+
+@app.before_request
+def begin_allocation_tracking():
+    if memoryStats.enabled() and request.endpoint in MEMORY_TRACKED_ENDPOINTS:
+        g.alloc_before = memoryStats.request_allocations.begin()
+
+@app.after_request
+def end_allocation_tracking(response):
+    if 'alloc_before' in g and memoryStats.enabled():
+        memoryStats.request_allocations.end(request.endpoint, g.alloc_before)
+    return response
+
 # Leaderboard functions
 def load_leaderboard():
     data_path = os.path.join(os.path.dirname(__file__), 'data', 'leaderboard.json')
@@ -34,6 +68,13 @@ def save_leaderboard(leaderboard_data):
     with open(data_path, 'w') as f:
         json.dump(leaderboard_data, f, indent=4)
 
+# Full score history with per-mode rank index (the top-50 file stays for /api/leaderboard).
+# Workers sharing the history file see each other's scores on their next lookup.
+SCORE_HISTORY_ENV = 'SEQUENCE_MASTER_SCORE_HISTORY'
+SCORE_HISTORY_PATH = os.environ.get(SCORE_HISTORY_ENV) or \
+    os.path.join(os.path.dirname(__file__), 'data', 'score_history.jsonl')
+leaderboard_index = LeaderboardIndex(SCORE_HISTORY_PATH).load(bootstrap=load_leaderboard())
+
 def update_leaderboard(name, score, mode):
     leaderboard = load_leaderboard()
     leaderboard.append({
@@ -46,6 +87,7 @@ def update_leaderboard(name, score, mode):
     leaderboard.sort(key=lambda x: x['score'], reverse=True)
     leaderboard = leaderboard[:50]
     save_leaderboard(leaderboard)
+    leaderboard_index.add(name, score, mode)
 
 def get_daily_challenge():
     """Generate a consistent daily challenge based on the date"""
@@ -54,6 +96,72 @@ def get_daily_challenge():
     # Use the seed to generate a specific sequence for the day
     return seed
 
+# Challenges travel as signed tokens; answers are regenerated, never stored in the session.
+# The session only keeps the id of the one challenge that may still be answered.
+CHALLENGE_TOKEN_MAX_AGE = 3600
+
+def activate_challenge():
+    """Allocate the next challenge id and make it the only answerable one"""
+    challenge_id = session.get('challenge_seq', 0) + 1
+    session['challenge_seq'] = challenge_id
+    session['active_challenge'] = challenge_id
+    return challenge_id
+
+def retire_challenge():
+    """Stop the active challenge's tokens from being answered again"""
+    session.pop('active_challenge', None)
+
+def new_challenge(mode, level, challenge_id, boss_index=None):
+    """Generate a puzzle and the signed token any worker can use to check it"""
+    if mode == 'daily' and boss_index is None:
+        nonce = get_daily_challenge() % (2 ** 48)
+    else:
+        nonce = new_nonce()
+    seed = derive_seed(app.secret_key, nonce)
+    claims = {'n': nonce, 'l': level, 'm': mode, 'c': challenge_id}
+    if boss_index is not None:
+        claims['b'] = boss_index
+    
+    # Code Breaker mode uses different patterns
+    if mode == 'code_breaker' and boss_index is None:
+        pattern_data = CodeBreakerPatterns.generate_pattern(level, seed)
+        token = issue_token(app.secret_key, r=pattern_data['type'], **claims)
+        return {
+            'sequence': pattern_data['sequence'],
+            'hint': pattern_data['hint'],
+            'pattern_type': pattern_data['type']
+        }, token
+    
+    game = SequenceMasterV2()
+    game.set_seed(seed)
+    game.level = level
+    game.generate_sequence()
+    token = issue_token(app.secret_key, r=game.rule_set, t=game.time_factor, **claims)
+    return {'sequence': game.sequence, 'hint': game.hint}, token
+
+def solve_challenge(claims):
+    """Regenerate (correct_answer, pattern_type) from verified token claims"""
+    seed = derive_seed(app.secret_key, claims['n'])
+    if claims['m'] == 'code_breaker' and 'b' not in claims:
+        pattern_data = CodeBreakerPatterns.generate_pattern(claims['l'], seed)
+        return pattern_data['answer'], pattern_data['type']
+    _, answer, _ = build_puzzle(seed, claims['l'], claims['r'], claims['t'])
+    return answer, 'numeric'
+
+def read_challenge(token, boss=False):
+    """Verify a challenge token against the caller's current game state"""
+    if not token:
+        raise InvalidToken('No active challenge')
+    claims = verify_token(app.secret_key, token, CHALLENGE_TOKEN_MAX_AGE)
+    if ('b' in claims) != boss \
+            or claims.get('c') is None \
+            or claims.get('c') != session.get('active_challenge') \
+            or claims.get('m') != session.get('game_mode', 'classic') \
+            or claims.get('l') != session.get('level', 1) \
+            or (boss and claims['b'] != session.get('boss_current')):
+        raise InvalidToken('Challenge is no longer active')
+    return claims
+
 def check_achievements(user_stats):
     """Check and award achievements based on user stats"""
     earned = []
@@ -75,6 +183,28 @@ def check_achievements(user_stats):
 def home():
     return render_template('game.html')
 
+@lru_cache(maxsize=1)
+def service_worker_source():
+    """sw.js with ASSET_VERSION set to a hash of the page template and static files"""
+    digest = hashlib.sha256()
+    paths = [os.path.join(app.root_path, app.template_folder, 'game.html')]
+    paths += sorted(os.path.join(d, name) for d, _, names in os.walk(app.static_folder) for name in names)
+    for path in paths:
+        digest.update(os.path.relpath(path, app.root_path).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    with open(os.path.join(app.static_folder, 'sw.js'), 'r') as f:
+        return f.read().replace('__ASSET_VERSION__', digest.hexdigest()[:12])
+
+@app.route('/sw.js')
+def service_worker():
+    # Served from the root so the worker's scope covers the whole app. The asset
+    # version changes the worker's bytes on every release, so browsers install
+    # it into a fresh cache.
+    response = app.response_class(service_worker_source(), mimetype='application/javascript')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 @app.route('/api/challenge')
 def get_challenge():
     mode = session.get('game_mode', 'classic')
@@ -93,43 +223,13 @@ def get_challenge():
             'message': f'🔥 BOSS BATTLE - Level {current_level}! Complete 3 sequences in 30 seconds!'
         })
     
-    # Code Breaker mode uses different patterns
-    if mode == 'code_breaker':
-        pattern_data = CodeBreakerPatterns.generate_pattern(current_level)
-        
-        session['last_sequence'] = pattern_data['sequence']
-        session['correct_answer'] = pattern_data['answer']
-        session['pattern_type'] = pattern_data['type']
-        session['start_time'] = datetime.now().timestamp()
-        
-        return jsonify({
-            'sequence': pattern_data['sequence'],
-            'hint': pattern_data['hint'],
-            'level': current_level,
-            'score': session.get('score', 0),
-            'timer': GAME_MODES[mode]['timer'],
-            'mode': mode,
-            'is_boss': False,
-            'pattern_type': pattern_data['type']
-        })
-        
-    game = SequenceMasterV2()
-    if mode == 'daily':
-        game.set_seed(get_daily_challenge())
-    
-    game.level = current_level
-    game.score = session.get('score', 0)
-    game.generate_sequence()
-    
-    session['last_sequence'] = game.sequence
-    session['correct_answer'] = game.correct_answer
-    session['start_time'] = datetime.now().timestamp()
+    challenge, token = new_challenge(mode, current_level, activate_challenge())
     
     return jsonify({
-        'sequence': game.sequence,
-        'hint': game.hint,
-        'level': game.level,
-        'score': game.score,
+        **challenge,
+        'token': token,
+        'level': current_level,
+        'score': session.get('score', 0),
         'timer': GAME_MODES[mode]['timer'],
         'mode': mode,
         'is_boss': False
@@ -141,27 +241,21 @@ def start_boss():
     mode = session.get('game_mode', 'classic')
     current_level = session.get('level', 1)
     
+    # All three sequences share one challenge id; boss_current orders them
+    challenge_id = activate_challenge()
     sequences = []
     for i in range(3):
-        game = SequenceMasterV2()
-        game.level = current_level
-        game.score = session.get('score', 0)
-        game.generate_sequence()
-        
-        sequences.append({
-            'sequence': game.sequence,
-            'hint': game.hint,
-            'correct_answer': game.correct_answer
-        })
+        challenge, token = new_challenge(mode, current_level, challenge_id, boss_index=i)
+        sequences.append({**challenge, 'token': token})
     
-    # Store boss data in session
-    session['boss_sequences'] = sequences
+    # Only progress lives in the session; answers are checked from the tokens
     session['boss_current'] = 0
     session['boss_start_time'] = datetime.now().timestamp()
+    session['boss_step_time'] = session['boss_start_time']
     
     return jsonify({
         'sequences': sequences,
-        'total_time': 30,
+        'total_time': BOSS_TIME_LIMIT,
         'level': current_level
     })
 
@@ -173,20 +267,29 @@ def check_boss_answer():
     
     try:
         answer = int(answer)
-    except ValueError:
+    except (TypeError, ValueError):
         return jsonify({'error': 'Invalid answer format'}), 400
     
-    boss_sequences = session.get('boss_sequences', [])
-    boss_current = session.get('boss_current', 0)
-    
-    if boss_current >= len(boss_sequences):
+    boss_current = session.get('boss_current')
+    if boss_current is None:
         return jsonify({'error': 'No active boss sequence'}), 400
     
-    correct_answer = boss_sequences[boss_current]['correct_answer']
+    try:
+        claims = read_challenge(data.get('token'), boss=True)
+    except InvalidToken as e:
+        return jsonify({'error': str(e)}), 400
+    
+    correct_answer, _ = solve_challenge(claims)
     is_correct = answer == correct_answer
+    # All three tokens are issued together, so time each one from the previous answer.
+    # Boss rounds share one 30s limit and get their own stats cells.
+    now = datetime.now().timestamp()
+    solve_stats.record(claims['r'], claims['l'], BOSS_STATS_MODE,
+                       now - session.get('boss_step_time', claims['i'] / 1000), is_correct)
     
     if is_correct:
         session['boss_current'] = boss_current + 1
+        session['boss_step_time'] = now
         
         # Check if boss is defeated
         if session['boss_current'] >= 3:
@@ -197,9 +300,12 @@ def check_boss_answer():
             session['level'] = session.get('level', 1) + 1
             
             # Clear boss data
-            session.pop('boss_sequences', None)
             session.pop('boss_current', None)
             session.pop('boss_start_time', None)
+            session.pop('boss_step_time', None)
+            retire_challenge()
+            event_log.record('boss', mode=session.get('game_mode', 'classic'),
+                             level=session['level'] - 1, defeated=True)
             
             return jsonify({
                 'correct': True,
@@ -217,9 +323,12 @@ def check_boss_answer():
             })
     else:
         # Boss battle failed
-        session.pop('boss_sequences', None)
+        event_log.record('boss', mode=session.get('game_mode', 'classic'),
+                         level=session.get('level', 1), defeated=False)
         session.pop('boss_current', None)
         session.pop('boss_start_time', None)
+        session.pop('boss_step_time', None)
+        retire_challenge()
         
         return jsonify({
             'correct': False,
@@ -229,6 +338,34 @@ def check_boss_answer():
             'message': 'Boss Battle Failed! Game Over.'
         })
 
+@app.route('/api/boss/timeout', methods=['POST'])
+def boss_timeout():
+    """End a boss battle whose timer ran out, counting the current sequence as failed"""
+    data = request.get_json()
+    try:
+        claims = read_challenge(data.get('token'), boss=True)
+    except InvalidToken as e:
+        return jsonify({'error': str(e)}), 400
+    
+    now = datetime.now().timestamp()
+    if now - session.get('boss_start_time', now) < BOSS_TIME_LIMIT:
+        return jsonify({'error': 'Boss timer is still running'}), 400
+    
+    solve_stats.record(claims['r'], claims['l'], BOSS_STATS_MODE,
+                       now - session.get('boss_step_time', claims['i'] / 1000), False)
+    event_log.record('boss', mode=session.get('game_mode', 'classic'),
+                     level=session.get('level', 1), defeated=False, timed_out=True)
+    session.pop('boss_current', None)
+    session.pop('boss_start_time', None)
+    session.pop('boss_step_time', None)
+    retire_challenge()
+    
+    return jsonify({
+        'game_over': True,
+        'correct_answer': solve_challenge(claims)[0],
+        'message': "⏰ Time's up! Boss Battle Failed!"
+    })
+
 @app.route('/api/answer', methods=['POST'])
 def check_answer():
     data = request.get_json()
@@ -238,12 +375,12 @@ def check_answer():
     if not answer:
         return jsonify({'error': 'No answer provided'}), 400
     
-    # Get correct answer and pattern type
-    correct_answer = session.get('correct_answer')
-    pattern_type = session.get('pattern_type', 'numeric')
-    
-    if correct_answer is None:
-        return jsonify({'error': 'No active challenge'}), 400
+    # Rebuild the correct answer and pattern type from the signed challenge
+    try:
+        claims = read_challenge(data.get('token'))
+    except InvalidToken as e:
+        return jsonify({'error': str(e)}), 400
+    correct_answer, pattern_type = solve_challenge(claims)
     
     # Handle different answer types based on pattern
     if pattern_type in ['color', 'keyboard']:
@@ -256,10 +393,20 @@ def check_answer():
             is_correct = answer == correct_answer
         except ValueError:
             return jsonify({'error': 'Invalid answer format'}), 400
+    
+    # Right or wrong, a challenge can only be answered once
+    retire_challenge()
         
     # Calculate time taken
-    start_time = session.get('start_time')
-    time_taken = datetime.now().timestamp() - start_time if start_time else 999
+    time_taken = datetime.now().timestamp() - claims['i'] / 1000
+    
+    event_log.record('answer',
+                     rule_set=claims.get('r'),
+                     level=session.get('level', 1),
+                     mode=mode,
+                     time_taken=round(time_taken, 3),
+                     correct=is_correct)
+    solve_stats.record(claims.get('r'), claims['l'], mode, time_taken, is_correct)
     
     # Update user stats
     user_stats = session.get('user_stats', {})
@@ -315,6 +462,10 @@ def check_answer():
         
         # Save score to leaderboard if it's significant (e.g., > 0)
         final_score = session.get("score", 0)
+        event_log.record('game_over',
+                         mode=mode,
+                         level=session.get('level', 1),
+                         score=final_score)
         if final_score > 0:
             # For now, we use a placeholder name or the one from session if we had it
             # In a real flow, we'd ask for name after game over. 
@@ -333,8 +484,8 @@ def check_answer():
 def reset_game():
     session['score'] = 0
     session['level'] = 1
-    session.pop('last_sequence', None)
-    session.pop('correct_answer', None)
+    session.pop('boss_current', None)
+    retire_challenge()
     return jsonify({'status': 'success', 'message': 'Game reset'})
 
 @app.route('/api/shop/purchase', methods=['POST'])
@@ -398,6 +549,10 @@ def submit_score():
 def get_stats():
     return jsonify(session.get('user_stats', {}))
 
+@app.route('/api/stats/global')
+def get_global_stats():
+    return jsonify(solve_stats.global_summary(RULE_NAMES))
+
 @app.route('/api/mode', methods=['POST'])
 def set_mode():
     data = request.get_json()
@@ -408,6 +563,8 @@ def set_mode():
     session['game_mode'] = mode
     session['score'] = 0
     session['level'] = 1
+    session.pop('boss_current', None)
+    retire_challenge()
     
     return jsonify({'status': 'success'})
 
@@ -427,12 +584,104 @@ def get_achievements():
 def get_leaderboard():
     return jsonify(load_leaderboard())
 
+def _leaderboard_mode(mode):
+    return mode == ALL_MODES or mode in GAME_MODES
+
+@app.route('/api/leaderboard/<mode>')
+def get_leaderboard_page(mode):
+    if not _leaderboard_mode(mode):
+        return jsonify({'error': 'Invalid game mode'}), 400
+    page = max(1, request.args.get('page', 1, type=int))
+    per_page = min(100, max(1, request.args.get('per_page', 20, type=int)))
+    return jsonify(leaderboard_index.page(mode, page, per_page))
+
+@app.route('/api/leaderboard/<mode>/rank')
+def get_leaderboard_rank(mode):
+    if not _leaderboard_mode(mode):
+        return jsonify({'error': 'Invalid game mode'}), 400
+    name = request.args.get('name')
+    if name:
+        ranked = leaderboard_index.rank_of_player(mode, name)
+        if ranked is None:
+            return jsonify({'error': 'Player not found'}), 404
+        return jsonify(ranked)
+    score = request.args.get('score', type=float)
+    if score is None:
+        return jsonify({'error': 'Provide a name or score'}), 400
+    return jsonify(leaderboard_index.rank_of_score(mode, score))
+
+@app.route('/api/leaderboard/<mode>/around')
+def get_leaderboard_around(mode):
+    if not _leaderboard_mode(mode):
+        return jsonify({'error': 'Invalid game mode'}), 400
+    name = request.args.get('name')
+    if not name:
+        return jsonify({'error': 'No name provided'}), 400
+    radius = min(25, max(0, request.args.get('radius', 5, type=int)))
+    neighbours = leaderboard_index.around(mode, name, radius)
+    if neighbours is None:
+        return jsonify({'error': 'Player not found'}), 404
+    return jsonify(neighbours)
+
 @app.route('/api/last_answer')
 def get_last_answer():
+    """Reveal the answer to a challenge whose time has run out, retiring it"""
+    try:
+        claims = read_challenge(request.args.get('token'))
+    except InvalidToken:
+        return jsonify({'last_answer': None})
+    timer = GAME_MODES[claims['m']]['timer']
+    elapsed = datetime.now().timestamp() - claims['i'] / 1000
+    if timer is None or elapsed < timer:
+        return jsonify({'last_answer': None})
+    retire_challenge()
+    
+    # Running out of time is a failed attempt, same as a wrong answer
+    event_log.record('answer',
+                     rule_set=claims.get('r'),
+                     level=claims['l'],
+                     mode=claims['m'],
+                     time_taken=round(elapsed, 3),
+                     correct=False,
+                     timed_out=True)
+    event_log.record('game_over',
+                     mode=claims['m'],
+                     level=claims['l'],
+                     score=session.get('score', 0))
+    solve_stats.record(claims.get('r'), claims['l'], claims['m'], elapsed, False)
+    
     return jsonify({
-        'last_answer': session.get('correct_answer')
+        'last_answer': solve_challenge(claims)[0]
     })
 
+@app.route('/api/powerup/debugger', methods=['POST'])
+def use_debugger():
+    """Spend a debugger charge to reveal one character of the current answer"""
+    data = request.get_json()
+    try:
+        claims = read_challenge(data.get('token'))
+    except InvalidToken as e:
+        return jsonify({'error': str(e)}), 400
+    
+    power_ups = session.get('power_ups', {'time_freeze': 0, 'debugger': 0, 'skip': 0})
+    if power_ups.get('debugger', 0) <= 0:
+        return jsonify({'error': 'No debugger charges left'}), 400
+    power_ups['debugger'] -= 1
+    session['power_ups'] = power_ups
+    
+    answer = str(solve_challenge(claims)[0])
+    return jsonify({
+        'digit': random.choice(answer),
+        'power_ups': power_ups
+    })
+
+@app.route('/api/debug/memory')
+def get_memory_report():
+    if not memoryStats.enabled():
+        return jsonify({'error': 'Memory tracing is disabled'}), 404
+    limit = min(50, max(1, request.args.get('limit', 10, type=int)))
+    return jsonify(memoryStats.report(limit))
+
 @app.route('/api/battle/start', methods=['POST'])
 def start_battle():
     # Placeholder for Battle Mode
@@ -0,0 +1,150 @@
+"""
+Headless Bot - Plays SequenceMasterV2.play() without a human
+Answers through a configurable accuracy and latency model and reports
+end-to-end game throughput.
+
+Usage:
+    python bot.py --games 1000 --workers 4 --accuracy 0.9 --latency 3.0
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from sequenceMaster import SequenceMasterV2
+
+
+class SequenceBot:
+    """Reference bot: answers correctly with probability `accuracy` after a simulated delay
+
+    Latency is simulated on a virtual clock, so games run at full speed while
+    the game loop still sees realistic (and occasionally too slow) answer times.
+    """
+
+    def __init__(self, accuracy=0.9, mean_latency=3.0, latency_jitter=1.0, max_rounds=100, seed=None):
+        self.accuracy = accuracy
+        self.mean_latency = mean_latency
+        self.latency_jitter = latency_jitter
+        self.max_rounds = max_rounds
+        self.rng = random.Random(seed)
+        self.game = None
+        self.rounds = 0
+        self.now = 0.0
+
+    def attach(self, game):
+        self.game = game
+        self.rounds = 0
+        return self
+
+    def clock(self):
+        return self.now
+
+    def think_time(self):
+        return max(0.0, self.rng.gauss(self.mean_latency, self.latency_jitter))
+
+    def answer(self, prompt=''):
+        """Stand-in for input(): returns the bot's answer to the current sequence"""
+        if self.rounds >= self.max_rounds:
+            return 'quit'
+        self.rounds += 1
+        self.now += self.think_time()
+        if self.rng.random() < self.accuracy:
+            return str(self.game.correct_answer)
+        return str(self.game.correct_answer + self.rng.choice([-1, 1]))
+
+
+def _silent(*args, **kwargs):
+    pass
+
+
+def game_seed(base_seed, index):
+    """Spread per-game seeds so neighbouring games don't share (seed + level) inputs"""
+    digest = hashlib.sha256(f"{base_seed}:{index}".encode()).hexdigest()
+    return int(digest, 16) % (2 ** 32)
+
+
+def play_one(index, accuracy=0.9, mean_latency=3.0, latency_jitter=1.0, max_rounds=100, base_seed=0):
+    """Play a single headless game. Returns (final_level, final_score)."""
+    seed = game_seed(base_seed, index)
+    game = SequenceMasterV2()
+    game.set_seed(seed)
+    bot = SequenceBot(accuracy, mean_latency, latency_jitter, max_rounds, seed=seed).attach(game)
+    score = game.play(input_fn=bot.answer, output_fn=_silent, clock=bot.clock)
+    return game.level, score
+
+
+def _play_chunk(args):
+    start, count, options = args
+    return [play_one(i, **options) for i in range(start, start + count)]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0
+    k = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+def run_benchmark(games=1000, workers=None, chunk_size=50, **options):
+    """Play `games` games across a process pool and summarise throughput and outcomes"""
+    workers = workers or os.cpu_count() or 1
+    chunks = [(start, min(chunk_size, games - start), options) for start in range(0, games, chunk_size)]
+
+    started = time.perf_counter()
+    if workers == 1:
+        results = [r for chunk in chunks for r in _play_chunk(chunk)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = [r for chunk in pool.map(_play_chunk, chunks) for r in chunk]
+    elapsed = time.perf_counter() - started
+
+    levels = Counter(level for level, _ in results)
+    scores = sorted(score for _, score in results)
+    return {
+        'games': len(results),
+        'workers': workers,
+        'elapsed_sec': round(elapsed, 3),
+        'games_per_sec': round(len(results) / elapsed, 1) if elapsed else None,
+        'level_distribution': {str(level): levels[level] for level in sorted(levels)},
+        'score_distribution': {
+            'mean': round(sum(scores) / len(scores), 1) if scores else 0,
+            'min': scores[0] if scores else 0,
+            'p50': percentile(scores, 50),
+            'p90': percentile(scores, 90),
+            'p99': percentile(scores, 99),
+            'max': scores[-1] if scores else 0
+        }
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Headless Sequence Master benchmark')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None, help='Process pool size (default: CPU count)')
+    parser.add_argument('--accuracy', type=float, default=0.9, help='Probability of a correct answer')
+    parser.add_argument('--latency', type=float, default=3.0, help='Mean answer time in seconds')
+    parser.add_argument('--jitter', type=float, default=1.0, help='Std-dev of answer time in seconds')
+    parser.add_argument('--max-rounds', type=int, default=100, help='Bot quits after this many answers')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        games=args.games,
+        workers=args.workers,
+        accuracy=args.accuracy,
+        mean_latency=args.latency,
+        latency_jitter=args.jitter,
+        max_rounds=args.max_rounds,
+        base_seed=args.seed
+    )
+    print(json.dumps(report, indent=4))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Challenge Tokens - Stateless, signed challenge descriptors
+A token carries everything needed to rebuild a puzzle (nonce, level, rule,
+time factor, issue time) plus an HMAC-SHA256 tag, so any worker holding the
+app secret can regenerate and check the answer without session state.
+
+The puzzle seed is derived from the nonce with the secret, so the token
+itself never reveals enough to compute the answer client-side.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import time
+
+TAG_BYTES = 16
+DEFAULT_MAX_AGE = 3600
+
+
+class InvalidToken(Exception):
+    """Raised when a token is malformed, tampered with or expired"""
+
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _tag(secret, payload):
+    key = secret.encode() if isinstance(secret, str) else secret
+    return hmac.new(key, payload, hashlib.sha256).digest()[:TAG_BYTES]
+
+
+def new_nonce():
+    return secrets.randbits(48)
+
+
+def derive_seed(secret, nonce):
+    """Turn a public nonce into a puzzle seed only the server can compute"""
+    key = secret.encode() if isinstance(secret, str) else secret
+    digest = hmac.new(key, f"seed:{nonce}".encode(), hashlib.sha256).digest()
+    return int.from_bytes(digest[:4], 'big')
+
+
+def issue_token(secret, **claims):
+    """Sign claims into a compact 'payload.tag' string. Adds the issue time in ms as 'i'."""
+    claims.setdefault('i', int(time.time() * 1000))
+    payload = json.dumps(claims, separators=(',', ':'), sort_keys=True).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_tag(secret, payload))}"
+
+
+def verify_token(secret, token, max_age=DEFAULT_MAX_AGE):
+    """Return the claims of a valid token or raise InvalidToken"""
+    if not isinstance(token, str) or token.count('.') != 1:
+        raise InvalidToken('Malformed challenge token')
+    encoded_payload, encoded_tag = token.split('.')
+    try:
+        payload = _b64decode(encoded_payload)
+        tag = _b64decode(encoded_tag)
+    except (ValueError, TypeError):
+        raise InvalidToken('Malformed challenge token')
+    if not hmac.compare_digest(tag, _tag(secret, payload)):
+        raise InvalidToken('Invalid challenge token')
+    try:
+        claims = json.loads(payload)
+    except ValueError:
+        raise InvalidToken('Malformed challenge token')
+    if not isinstance(claims, dict) or not isinstance(claims.get('i'), int):
+        raise InvalidToken('Malformed challenge token')
+    if max_age is not None and time.time() * 1000 - claims['i'] > max_age * 1000:
+        raise InvalidToken('Challenge token expired')
+    return claims
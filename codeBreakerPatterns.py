@@ -7,7 +7,7 @@ import random
 class CodeBreakerPatterns:
     
     @staticmethod
-    def generate_color_pattern(level):
+    def generate_color_pattern(level, rng=random):
         """Generate a color sequence pattern"""
         colors = ['Red', 'Blue', 'Green', 'Yellow', 'Purple', 'Orange']
         
@@ -19,7 +19,7 @@ class CodeBreakerPatterns:
         else:
             # Repeating sequence
             seq_len = min(3, 2 + level // 5)
-            pattern = random.sample(colors, seq_len) * 2
+            pattern = rng.sample(colors, seq_len) * 2
             answer = pattern[0]
             hint = f"The pattern repeats every {seq_len} colors"
         
@@ -31,7 +31,7 @@ class CodeBreakerPatterns:
         }
     
     @staticmethod
-    def generate_keyboard_pattern(level):
+    def generate_keyboard_pattern(level, rng=random):
         """Generate a keyboard layout pattern"""
         # QWERTY rows
         rows = [
@@ -40,17 +40,17 @@ class CodeBreakerPatterns:
             ['Z', 'X', 'C', 'V', 'B', 'N']
         ]
         
-        row = random.choice(rows)
+        row = rng.choice(rows)
         if level <= 3:
             # Simple sequential
-            start = random.randint(0, len(row) - 4)
+            start = rng.randint(0, len(row) - 4)
             pattern = row[start:start+3]
             answer = row[start+3]
             hint = "Follow the keyboard layout left to right"
         else:
             # Skip pattern
             skip = 2 if level > 5 else 1
-            start = random.randint(0, len(row) - 4)
+            start = rng.randint(0, len(row) - 4)
             pattern = [row[start + i*skip] for i in range(3) if start + i*skip < len(row)]
             answer = row[start + 3*skip] if start + 3*skip < len(row) else row[-1]
             hint = f"Keys skip by {skip} on the keyboard"
@@ -63,14 +63,14 @@ class CodeBreakerPatterns:
         }
     
     @staticmethod
-    def generate_debug_pattern(level):
+    def generate_debug_pattern(level, rng=random):
         """Generate a 'find the error' pattern"""
         # Create a correct sequence with one wrong element
         base = list(range(2, 12, 2))  # [2, 4, 6, 8, 10]
         
         # Insert an error
-        error_pos = random.randint(1, len(base) - 2)
-        base[error_pos] = base[error_pos] + random.choice([1, 3, -1])
+        error_pos = rng.randint(1, len(base) - 2)
+        base[error_pos] = base[error_pos] + rng.choice([1, 3, -1])
         
         return {
             'type': 'debug',
@@ -80,13 +80,14 @@ class CodeBreakerPatterns:
         }
     
     @staticmethod
-    def generate_pattern(level):
-        """Generate a random Code Breaker pattern"""
-        pattern_type = random.choice(['color', 'keyboard', 'debug'])
+    def generate_pattern(level, seed=None):
+        """Generate a random Code Breaker pattern (deterministic when a seed is given)"""
+        rng = random.Random(seed) if seed is not None else random
+        pattern_type = rng.choice(['color', 'keyboard', 'debug'])
         
         if pattern_type == 'color':
-            return CodeBreakerPatterns.generate_color_pattern(level)
+            return CodeBreakerPatterns.generate_color_pattern(level, rng)
         elif pattern_type == 'keyboard':
-            return CodeBreakerPatterns.generate_keyboard_pattern(level)
+            return CodeBreakerPatterns.generate_keyboard_pattern(level, rng)
         else:
-            return CodeBreakerPatterns.generate_debug_pattern(level)
+            return CodeBreakerPatterns.generate_debug_pattern(level, rng)
@@ -0,0 +1,312 @@
+"""
+Leaderboard Index - Per-mode order-statistic trees over the full score history
+Answers "page of ranks", "rank of a score/player" and "neighbours of a player"
+in O(log n) without ever sorting the whole history.
+
+Ranks use competition ranking everywhere: equal scores share a rank, which is
+one more than the number of strictly higher scores (500, 300, 300, 100 rank
+1, 2, 2, 4). Ties are listed in submission order.
+
+Every submitted score is appended to a JSON-lines history file. At startup the
+file is read once and each mode's tree is bulk-built in O(n) from the sorted
+entries. After that, every lookup first indexes whatever other workers have
+appended since the last read (a stat plus a read of the new tail), so all
+workers sharing the file give the same answers.
+"""
+import json
+import os
+import random
+import threading
+from datetime import datetime
+
+ALL_MODES = 'all'
+
+
+class _Node:
+    __slots__ = ('key', 'value', 'priority', 'left', 'right', 'size')
+
+    def __init__(self, key, value, priority):
+        self.key = key
+        self.value = value
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.size = 1
+
+
+def _size(node):
+    return node.size if node is not None else 0
+
+
+def _update(node):
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+
+class OrderStatisticTree:
+    """Treap augmented with subtree sizes; keys must be unique and comparable"""
+
+    def __init__(self, items=(), rng=None):
+        self._rng = rng or random.Random()
+        self.root = self._build(list(items))
+
+    def __len__(self):
+        return _size(self.root)
+
+    def _build(self, items):
+        """Build from items already sorted by key in O(n) (Cartesian tree on random priorities)"""
+        stack = []
+        for key, value in items:
+            node = _Node(key, value, self._rng.random())
+            last = None
+            while stack and stack[-1].priority < node.priority:
+                last = stack.pop()
+                _update(last)
+            node.left = last
+            if stack:
+                stack[-1].right = node
+            stack.append(node)
+        while len(stack) > 1:
+            _update(stack.pop())
+        if not stack:
+            return None
+        _update(stack[0])
+        return stack[0]
+
+    def _split(self, node, key):
+        """Split into (< key, >= key)"""
+        if node is None:
+            return None, None
+        if node.key < key:
+            left, right = self._split(node.right, key)
+            node.right = left
+            _update(node)
+            return node, right
+        left, right = self._split(node.left, key)
+        node.left = right
+        _update(node)
+        return left, node
+
+    def _merge(self, left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            _update(left)
+            return left
+        right.left = self._merge(left, right.left)
+        _update(right)
+        return right
+
+    def insert(self, key, value):
+        left, right = self._split(self.root, key)
+        node = _Node(key, value, self._rng.random())
+        self.root = self._merge(self._merge(left, node), right)
+
+    def count_less(self, key):
+        """Number of keys strictly less than key"""
+        count = 0
+        node = self.root
+        while node is not None:
+            if node.key < key:
+                count += _size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def select(self, index):
+        """Return (key, value) at 0-based position index"""
+        if index < 0 or index >= len(self):
+            raise IndexError('index out of range')
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node.key, node.value
+            else:
+                index -= left_size + 1
+                node = node.right
+
+
+class LeaderboardIndex:
+    """Unbounded score history with one order-statistic tree per mode (plus 'all')"""
+
+    def __init__(self, history_path):
+        self.history_path = history_path
+        self._lock = threading.Lock()
+        self._trees = {}
+        self._best = {}
+        self._seq = 0
+        self._offset = 0
+
+    def load(self, bootstrap=None):
+        """Rebuild every tree from the history file.
+
+        If the file does not exist yet, `bootstrap` entries (e.g. the legacy
+        top-50 leaderboard) are written to it first.
+        """
+        if not os.path.exists(self.history_path) and bootstrap:
+            os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
+            with open(self.history_path, 'w') as f:
+                for entry in bootstrap:
+                    f.write(json.dumps(entry) + '\n')
+
+        try:
+            with open(self.history_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b''
+        offset, entries = _complete_entries(data)
+
+        by_mode = {ALL_MODES: []}
+        best = {}
+        for seq, entry in enumerate(entries):
+            key = (-entry['score'], seq)
+            mode = entry.get('mode', 'classic')
+            for m in (ALL_MODES, mode):
+                by_mode.setdefault(m, []).append((key, entry))
+                best_key = best.setdefault(m, {}).get(entry.get('name'))
+                if best_key is None or key < best_key:
+                    best[m][entry.get('name')] = key
+
+        with self._lock:
+            self._trees = {m: OrderStatisticTree(sorted(items, key=lambda kv: kv[0]))
+                           for m, items in by_mode.items()}
+            self._best = best
+            self._seq = len(entries)
+            self._offset = offset
+        return self
+
+    def add(self, name, score, mode, date=None):
+        """Persist a score to the history and index it"""
+        entry = {
+            'name': name,
+            'score': score,
+            'mode': mode,
+            'date': date or datetime.now().strftime('%Y-%m-%d %H:%M')
+        }
+        with self._lock:
+            os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
+            with open(self.history_path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+            # Indexes this entry along with anything other workers appended before it
+            self._sync()
+        return entry
+
+    def _sync(self):
+        """Index complete lines appended since the last read. Caller holds the lock."""
+        try:
+            size = os.path.getsize(self.history_path)
+        except OSError:
+            return
+        if size <= self._offset:
+            return
+        with open(self.history_path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        consumed, entries = _complete_entries(data)
+        self._offset += consumed
+        for entry in entries:
+            self._index(entry)
+
+    def _index(self, entry):
+        key = (-entry['score'], self._seq)
+        self._seq += 1
+        for m in (ALL_MODES, entry.get('mode', 'classic')):
+            tree = self._trees.get(m)
+            if tree is None:
+                tree = self._trees[m] = OrderStatisticTree()
+            tree.insert(key, entry)
+            best = self._best.setdefault(m, {})
+            name = entry.get('name')
+            if name not in best or key < best[name]:
+                best[name] = key
+
+    def total(self, mode):
+        with self._lock:
+            self._sync()
+            return len(self._trees.get(mode, ()))
+
+    def page(self, mode, page=1, per_page=20):
+        """Entries ranked ((page-1)*per_page + 1) .. (page*per_page)"""
+        with self._lock:
+            self._sync()
+            tree = self._trees.get(mode)
+            total = len(tree) if tree is not None else 0
+            start = (page - 1) * per_page
+            return {
+                'mode': mode,
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'entries': [self._ranked(tree, i) for i in range(start, min(start + per_page, total))]
+            }
+
+    def rank_of_score(self, mode, score):
+        """Rank a score would get: one more than the number of strictly higher scores"""
+        with self._lock:
+            self._sync()
+            tree = self._trees.get(mode)
+            return {'mode': mode, 'score': score,
+                    'rank': _competition_rank(tree, score) if tree is not None else 1,
+                    'total': len(tree) if tree is not None else 0}
+
+    def rank_of_player(self, mode, name):
+        """Rank of a player's best score in a mode, or None if they have none"""
+        with self._lock:
+            self._sync()
+            key = self._best.get(mode, {}).get(name)
+            if key is None:
+                return None
+            tree = self._trees[mode]
+            position = tree.count_less(key)
+            return self._ranked(tree, position)
+
+    def around(self, mode, name, radius=5):
+        """A player's best entry with up to `radius` neighbours on each side"""
+        with self._lock:
+            self._sync()
+            key = self._best.get(mode, {}).get(name)
+            if key is None:
+                return None
+            tree = self._trees[mode]
+            position = tree.count_less(key)
+            start = max(0, position - radius)
+            end = min(len(tree), position + radius + 1)
+            return {
+                'mode': mode,
+                'rank': _competition_rank(tree, -key[0]),
+                'total': len(tree),
+                'entries': [self._ranked(tree, i) for i in range(start, end)]
+            }
+
+    @staticmethod
+    def _ranked(tree, position):
+        _, entry = tree.select(position)
+        return {**entry, 'rank': _competition_rank(tree, entry['score'])}
+
+
+def _complete_entries(data):
+    """Parse the complete lines in `data`. Returns (bytes consumed, valid entries).
+
+    A trailing partial line (another worker mid-append) is left for the next read.
+    """
+    end = data.rfind(b'\n') + 1
+    entries = []
+    for line in data[:end].splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict) and isinstance(entry.get('score'), (int, float)):
+            entries.append(entry)
+    return end, entries
+
+
+def _competition_rank(tree, score):
+    # Keys are (-score, seq) with seq >= 0, so (-score, -1) sorts before every tie
+    return tree.count_less((-score, -1)) + 1
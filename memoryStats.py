@@ -0,0 +1,142 @@
+"""
+Memory Stats - Opt-in allocation accounting built on tracemalloc
+Enable with SEQUENCE_MASTER_TRACEMALLOC=1. When enabled the app exposes
+/api/debug/memory with the top allocation sites and per-endpoint counters.
+Tracing switched on any other way (PYTHONTRACEMALLOC, -X tracemalloc, a
+library) does not count as opting in.
+
+tracemalloc is process-wide, so per-request numbers are exact only when
+requests don't overlap (a single-threaded worker, or the test client).
+"""
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+ENV_FLAG = 'SEQUENCE_MASTER_TRACEMALLOC'
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def requested():
+    return os.environ.get(ENV_FLAG, '').lower() in ('1', 'true', 'yes')
+
+
+_enabled = False
+
+
+def start(frames=1):
+    """Opt in: start tracing (if needed) and turn on the debug endpoint and request hooks"""
+    global _enabled
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    _enabled = True
+
+
+def stop():
+    global _enabled
+    _enabled = False
+    tracemalloc.stop()
+
+
+def enabled():
+    return _enabled and tracemalloc.is_tracing()
+
+
+def _site_name(filename):
+    if filename.startswith(ROOT):
+        return os.path.relpath(filename, ROOT)
+    return filename
+
+
+def top_sites(limit=10):
+    """Top allocation sites grouped by module and by line from a fresh snapshot"""
+    snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+    by_module = snapshot.statistics('filename')[:limit]
+    by_line = snapshot.statistics('lineno')[:limit]
+    return {
+        'modules': [
+            {'module': _site_name(s.traceback[0].filename), 'size': s.size, 'count': s.count}
+            for s in by_module
+        ],
+        'lines': [
+            {'site': f"{_site_name(s.traceback[0].filename)}:{s.traceback[0].lineno}",
+             'size': s.size, 'count': s.count}
+            for s in by_line
+        ]
+    }
+
+
+@contextmanager
+def measure():
+    """Yield a dict that is filled with net and peak bytes allocated inside the block"""
+    result = {'net': 0, 'peak': 0}
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    try:
+        yield result
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        result['net'] = current - before
+        result['peak'] = max(0, peak - before)
+        if started_here:
+            tracemalloc.stop()
+
+
+class RequestAllocations:
+    """Per-endpoint allocation counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def begin(self):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        return before
+
+    def end(self, endpoint, before):
+        current, peak = tracemalloc.get_traced_memory()
+        net = current - before
+        peak = max(0, peak - before)
+        with self._lock:
+            c = self._counters.setdefault(endpoint, {
+                'requests': 0, 'net_total': 0, 'peak_total': 0, 'peak_max': 0
+            })
+            c['requests'] += 1
+            c['net_total'] += net
+            c['peak_total'] += peak
+            c['peak_max'] = max(c['peak_max'], peak)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                endpoint: {**c, 'peak_avg': c['peak_total'] // c['requests']}
+                for endpoint, c in self._counters.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+request_allocations = RequestAllocations()
+
+
+def report(limit=10):
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        'traced_current': current,
+        'traced_peak': peak,
+        'top_sites': top_sites(limit),
+        'requests': request_allocations.snapshot()
+    }
@@ -4,6 +4,131 @@ import hashlib
 import json
 import os
 from datetime import datetime
+from functools import lru_cache
+
+PUZZLE_CACHE_SIZE = 4096
+# Only the last few rules are consulted when picking the next one
+PATTERN_HISTORY_LIMIT = 3
+_default_patterns_config = None
+
+@lru_cache(maxsize=PUZZLE_CACHE_SIZE)
+def build_puzzle(seed, level, rule_set, time_factor):
+    """Build a puzzle as a pure function of its inputs.
+    
+    Returns (sequence, answer, hint) with the answer still in place as the
+    last element. Results are memoized, so hot inputs (e.g. the shared daily
+    seed) cost a dictionary lookup instead of a regeneration.
+    """
+    rng = random.Random(f"{seed}:{level}:{rule_set}")
+    base = rng.randint(1, 10)
+    
+    if rule_set == 0:  # Twisted Arithmetic
+        diff = (level % 3 + 1) * time_factor
+        sequence = [base]
+        for i in range(5):
+            next_num = sequence[-1] + diff
+            if i % 2 == 0:
+                next_num = next_num * (level % 2 + 1)
+            sequence.append(next_num)
+        hint = "The difference dances with time, and every other step doubles or stays."
+
+    elif rule_set == 1:  # Mirrored Geometric
+        ratio = (level % 4 + 1) if time_factor < 3 else 2
+        sequence = [base]
+        for i in range(5):
+            next_num = sequence[-1] * ratio
+            if str(next_num)[::-1].isdigit():
+                next_num = int(str(next_num)[::-1])
+            sequence.append(next_num)
+        hint = "Growth reflects itself, but only when it can see its own face."
+
+    elif rule_set == 2:  # Wordplay Numbers
+        num_words = ["zero", "one", "two", "three", "four", "five", "six"]
+        start_idx = rng.randint(0, 3)
+        sequence = [start_idx]
+        for i in range(5):
+            word = num_words[sequence[-1]]
+            next_num = (len(word) + level) % 7
+            if time_factor > 2:
+                next_num = (next_num + sequence[-1]) % 7
+            sequence.append(next_num)
+        hint = "Numbers speak in letters, and their lengths lead the way."
+
+    elif rule_set == 3:  # Fibonacci Twist
+        sequence = [base]
+        second = base + level
+        sequence.append(second)
+        for i in range(4):
+            next_num = sequence[-1] + sequence[-2]
+            if i % 2 == 0:
+                next_num = next_num % (50 * level)  # Keep numbers manageable
+            sequence.append(next_num)
+        hint = "Each step looks back twice, but sometimes needs to stay grounded."
+
+    elif rule_set == 4:  # Prime Dance
+        def next_prime(n):
+            while True:
+                n += 1
+                if all(n % i != 0 for i in range(2, int(n ** 0.5) + 1)):
+                    return n
+
+        sequence = [base]
+        current = base
+        for _ in range(5):
+            if len(sequence) % 2 == 0:
+                current = next_prime(current)
+            else:
+                current = current * 2 - 1
+            sequence.append(current)
+        hint = "Primes lead the dance, but take breaks to double back."
+
+    elif rule_set == 5:  # Digital Root Pattern
+        def digital_root(n):
+            while n > 9:
+                n = sum(int(d) for d in str(n))
+            return n
+
+        sequence = [base]
+        for i in range(5):
+            next_num = sequence[-1] * (i + 2)
+            next_num = digital_root(next_num) * level
+            sequence.append(next_num)
+        hint = "When numbers grow too large, they find their root and grow again."
+
+    elif rule_set == 6:  # Binary Pattern
+        sequence = [base]
+        for i in range(5):
+            binary = bin(sequence[-1])[2:]  # Convert to binary string
+            rotated = binary[1:] + binary[0]  # Rotate binary digits
+            next_num = int(rotated, 2) + level
+            sequence.append(next_num)
+        hint = "The binary dance: rotate and grow."
+
+    else:  # Chaotic Blend with Level Complexity
+        sequence = [base]
+        for i in range(5):
+            if i % 3 == 0:
+                next_num = sequence[-1] * (level % 3 + 1)
+            elif i % 3 == 1:
+                next_num = sequence[-1] + time_factor
+            else:
+                next_num = (sequence[-1] ** 2 % 100) + level
+            sequence.append(next_num)
+        hint = "Three rules wrestle: multiply, add time, then square and grow."
+
+    return tuple(sequence), sequence[-1], hint
+
+def puzzle_cache_stats():
+    """Hit/miss counters for the puzzle cache"""
+    info = build_puzzle.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+        'hit_rate': round(info.hits / lookups, 4) if lookups else 0.0
+    }
 
 class SequenceMasterV2:
     def __init__(self, patterns_config=None):
@@ -13,6 +138,9 @@ class SequenceMasterV2:
         self.hint = ""
         self.correct_answer = None
         self.custom_seed = None
+        self.seed = None
+        self.rule_set = None
+        self.time_factor = None
         self.pattern_history = []
         
         if patterns_config:
@@ -22,13 +150,18 @@ class SequenceMasterV2:
             self.patterns_config = self._load_default_config()
 
     def _load_default_config(self):
+        # Parsed once per process and shared; games only read from it
+        global _default_patterns_config
+        if _default_patterns_config is not None:
+            return _default_patterns_config
         try:
             config_path = os.path.join(os.path.dirname(__file__), 'config', 'game_config.json')
             with open(config_path, 'r') as f:
-                return json.load(f)['patterns']
+                _default_patterns_config = json.load(f)['patterns']
         except:
             # Minimal fallback if file missing
             return {}
+        return _default_patterns_config
 
     def set_seed(self, seed):
         """Set a custom seed for deterministic sequence generation"""
@@ -40,116 +173,31 @@ class SequenceMasterV2:
             return self.custom_seed
         return int(hashlib.sha256(str(datetime.now()).encode()).hexdigest(), 16) % 1000
         
-    def generate_sequence(self):
-        """Generate a cryptic sequence based on level and external factors"""
-        self.sequence = []
+    def generate_sequence(self, time_factor=None):
+        """Generate a cryptic sequence based on level and external factors
+        
+        time_factor defaults to the current second (mod 5); pass it explicitly
+        to make the result fully reproducible.
+        """
         seed = self.get_seed()
-        random.seed(seed + self.level)
+        rng = random.Random(seed + self.level)
         
         # Ensure we don't repeat recent patterns
-        rule_set = random.randint(0, 7)  # Extended pattern types
+        rule_set = rng.randint(0, 7)  # Extended pattern types
         while rule_set in self.pattern_history[-3:]:  # Avoid last 3 patterns
-            rule_set = random.randint(0, 7)
+            rule_set = rng.randint(0, 7)
         self.pattern_history.append(rule_set)
+        del self.pattern_history[:-PATTERN_HISTORY_LIMIT]
         
-        base = random.randint(1, 10)
-        time_factor = datetime.now().second % 5
-        
-        if rule_set == 0:  # Twisted Arithmetic
-            diff = (self.level % 3 + 1) * time_factor
-            self.sequence = [base]
-            for i in range(5):
-                next_num = self.sequence[-1] + diff
-                if i % 2 == 0:
-                    next_num = next_num * (self.level % 2 + 1)
-                self.sequence.append(next_num)
-            self.hint = "The difference dances with time, and every other step doubles or stays."
-                
-        elif rule_set == 1:  # Mirrored Geometric
-            ratio = (self.level % 4 + 1) if time_factor < 3 else 2
-            self.sequence = [base]
-            for i in range(5):
-                next_num = self.sequence[-1] * ratio
-                if str(next_num)[::-1].isdigit():
-                    next_num = int(str(next_num)[::-1])
-                self.sequence.append(next_num)
-            self.hint = "Growth reflects itself, but only when it can see its own face."
-                
-        elif rule_set == 2:  # Wordplay Numbers
-            num_words = ["zero", "one", "two", "three", "four", "five", "six"]
-            start_idx = random.randint(0, 3)
-            self.sequence = [start_idx]
-            for i in range(5):
-                word = num_words[self.sequence[-1]]
-                next_num = (len(word) + self.level) % 7
-                if time_factor > 2:
-                    next_num = (next_num + self.sequence[-1]) % 7
-                self.sequence.append(next_num)
-            self.hint = "Numbers speak in letters, and their lengths lead the way."
-                
-        elif rule_set == 3:  # Fibonacci Twist
-            self.sequence = [base]
-            second = base + self.level
-            self.sequence.append(second)
-            for i in range(4):
-                next_num = self.sequence[-1] + self.sequence[-2]
-                if i % 2 == 0:
-                    next_num = next_num % (50 * self.level)  # Keep numbers manageable
-                self.sequence.append(next_num)
-            self.hint = "Each step looks back twice, but sometimes needs to stay grounded."
-            
-        elif rule_set == 4:  # Prime Dance
-            def next_prime(n):
-                while True:
-                    n += 1
-                    if all(n % i != 0 for i in range(2, int(n ** 0.5) + 1)):
-                        return n
-                        
-            self.sequence = [base]
-            current = base
-            for _ in range(5):
-                if len(self.sequence) % 2 == 0:
-                    current = next_prime(current)
-                else:
-                    current = current * 2 - 1
-                self.sequence.append(current)
-            self.hint = "Primes lead the dance, but take breaks to double back."
-            
-        elif rule_set == 5:  # Digital Root Pattern
-            def digital_root(n):
-                while n > 9:
-                    n = sum(int(d) for d in str(n))
-                return n
-                
-            self.sequence = [base]
-            for i in range(5):
-                next_num = self.sequence[-1] * (i + 2)
-                next_num = digital_root(next_num) * self.level
-                self.sequence.append(next_num)
-            self.hint = "When numbers grow too large, they find their root and grow again."
-            
-        elif rule_set == 6:  # Binary Pattern
-            self.sequence = [base]
-            for i in range(5):
-                binary = bin(self.sequence[-1])[2:]  # Convert to binary string
-                rotated = binary[1:] + binary[0]  # Rotate binary digits
-                next_num = int(rotated, 2) + self.level
-                self.sequence.append(next_num)
-            self.hint = "The binary dance: rotate and grow."
-            
-        else:  # Chaotic Blend with Level Complexity
-            self.sequence = [base]
-            for i in range(5):
-                if i % 3 == 0:
-                    next_num = self.sequence[-1] * (self.level % 3 + 1)
-                elif i % 3 == 1:
-                    next_num = self.sequence[-1] + time_factor
-                else:
-                    next_num = (self.sequence[-1] ** 2 % 100) + self.level
-                self.sequence.append(next_num)
-            self.hint = "Three rules wrestle: multiply, add time, then square and grow."
-                
-        self.correct_answer = self.sequence[-1]
+        if time_factor is None:
+            time_factor = datetime.now().second % 5
+        
+        self.seed = seed
+        self.rule_set = rule_set
+        self.time_factor = time_factor
+        
+        sequence, self.correct_answer, self.hint = build_puzzle(seed, self.level, rule_set, time_factor)
+        self.sequence = list(sequence)
         self.sequence[-1] = '?'
         
     def get_difficulty_rating(self):
@@ -171,49 +219,55 @@ class SequenceMasterV2:
         pattern_data = self.patterns_config.get(pattern_id, {'name': "Unknown Pattern"})
         return pattern_data['name']
         
-    def display_sequence(self):
+    def display_sequence(self, output_fn=print):
         """Display sequence and hint"""
-        print(f"\nLevel {self.level} - Score: {self.score}")
-        print("Sequence:", " ".join(str(x) for x in self.sequence))
-        print(f"Hint: {self.hint}")
+        output_fn(f"\nLevel {self.level} - Score: {self.score}")
+        output_fn("Sequence:", " ".join(str(x) for x in self.sequence))
+        output_fn(f"Hint: {self.hint}")
+        
+    def play(self, input_fn=input, output_fn=print, clock=time.time):
+        """Main game loop with anti-automation
         
-    def play(self):
-        """Main game loop with anti-automation"""
-        print("Welcome to Sequence Master V2: The Cryptic Progression!")
-        print("Solve the sequence using the hint. Time and level twist the rules.")
-        print("Type 'quit' to end.\n")
+        I/O and the clock are pluggable so the loop can run headless
+        (see bot.py). Returns the final score.
+        """
+        output_fn("Welcome to Sequence Master V2: The Cryptic Progression!")
+        output_fn("Solve the sequence using the hint. Time and level twist the rules.")
+        output_fn("Type 'quit' to end.\n")
         
         while True:
             self.generate_sequence()
-            start_time = time.time()
-            self.display_sequence()
+            start_time = clock()
+            self.display_sequence(output_fn)
             
             # Anti-automation: Randomize input prompt
             prompt = random.choice(["Enter the missing number: ", 
                                   "What completes it? ",
                                   "Solve the riddle: "])
-            answer = input(prompt).strip()
+            answer = input_fn(prompt).strip()
             
             if answer.lower() == 'quit':
-                print(f"\nGame Over! Final Score: {self.score}")
+                output_fn(f"\nGame Over! Final Score: {self.score}")
                 break
                 
             try:
                 answer = int(answer)
-                time_taken = time.time() - start_time
+                time_taken = clock() - start_time
                 
                 # Score only if answered within 20s and correct
                 if answer == self.correct_answer and time_taken < 20:
                     self.score += int(200 / (time_taken + 1)) * self.level
                     self.level += 1
-                    print("Correct! Next challenge awaits...")
+                    output_fn("Correct! Next challenge awaits...")
                 else:
-                    print(f"Wrong or too slow! Answer was {self.correct_answer}")
-                    print(f"Final Score: {self.score}")
+                    output_fn(f"Wrong or too slow! Answer was {self.correct_answer}")
+                    output_fn(f"Final Score: {self.score}")
                     break
                     
             except ValueError:
-                print("Numbers only, please!")
+                output_fn("Numbers only, please!")
+        
+        return self.score
                 
 if __name__ == "__main__":
     game = SequenceMasterV2()
@@ -0,0 +1,340 @@
+"""
+Solve Stats - Population-wide solve time and failure rate per rule
+Keeps a mergeable streaming quantile sketch plus counters for every
+(rule, level band, mode). Updates are O(1). Each worker periodically writes
+its own snapshot under data/stats/ (or SEQUENCE_MASTER_STATS_DIR) and any
+worker can merge all snapshots to serve the global view.
+
+Live workers refresh their snapshot's mtime on every flush. A snapshot that
+stops being refreshed belongs to a worker that has exited; a live worker
+claims it, folds it into its own counters and deletes it, so the number of
+files tracks the number of live workers rather than the number of restarts.
+"""
+import json
+import math
+import os
+import threading
+import time
+
+STATS_DIR_ENV = 'SEQUENCE_MASTER_STATS_DIR'
+DEFAULT_STATS_DIR = os.path.join(os.path.dirname(__file__), 'data', 'stats')
+SNAPSHOT_PREFIX = 'solve-stats-'
+SNAPSHOT_SUFFIX = '.json'
+LEVEL_BAND_SIZE = 5
+
+
+def default_stats_dir():
+    """SEQUENCE_MASTER_STATS_DIR if set, else data/stats (read at call time)"""
+    return os.environ.get(STATS_DIR_ENV) or DEFAULT_STATS_DIR
+
+
+def level_band(level):
+    """Group levels into bands of LEVEL_BAND_SIZE: 1-5, 6-10, ..."""
+    low = (max(1, int(level)) - 1) // LEVEL_BAND_SIZE * LEVEL_BAND_SIZE + 1
+    return f"{low}-{low + LEVEL_BAND_SIZE - 1}"
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch with bounded relative error (DDSketch-style)
+
+    Any quantile is returned within `relative_accuracy` of the true value.
+    Two sketches with the same accuracy merge exactly by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy=0.02, min_value=1e-3):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        value = float(value)
+        if value <= self.min_value:
+            self.zero_count += 1
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError('Cannot merge sketches with different accuracy')
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i] in relative terms
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'min_value': self.min_value,
+            'buckets': {str(i): n for i, n in self.buckets.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['relative_accuracy'], data['min_value'])
+        sketch.buckets = {int(i): n for i, n in data['buckets'].items()}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        sketch.total = data['total']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        return sketch
+
+
+class _Cell:
+    __slots__ = ('attempts', 'failures', 'solve_times')
+
+    def __init__(self):
+        self.attempts = 0
+        self.failures = 0
+        self.solve_times = QuantileSketch()
+
+    def merge(self, other):
+        self.attempts += other.attempts
+        self.failures += other.failures
+        self.solve_times.merge(other.solve_times)
+
+
+class SolveStats:
+    """Per-(rule, level band, mode) counters and solve-time sketches"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cells = {}
+
+    def record(self, rule, level, mode, time_taken, correct):
+        key = (str(rule), level_band(level), mode)
+        with self._lock:
+            cell = self._cells.get(key)
+            if cell is None:
+                cell = self._cells[key] = _Cell()
+            cell.attempts += 1
+            if correct:
+                cell.solve_times.add(time_taken)
+            else:
+                cell.failures += 1
+
+    def merge(self, other):
+        with self._lock:
+            for key, cell in other._cells.items():
+                mine = self._cells.get(key)
+                if mine is None:
+                    mine = self._cells[key] = _Cell()
+                mine.merge(cell)
+        return self
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'cells': [
+                    {'rule': rule, 'level_band': band, 'mode': mode,
+                     'attempts': cell.attempts, 'failures': cell.failures,
+                     'solve_times': cell.solve_times.to_dict()}
+                    for (rule, band, mode), cell in self._cells.items()
+                ]
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        for row in data.get('cells', []):
+            cell = _Cell()
+            cell.attempts = row['attempts']
+            cell.failures = row['failures']
+            cell.solve_times = QuantileSketch.from_dict(row['solve_times'])
+            stats._cells[(row['rule'], row['level_band'], row['mode'])] = cell
+        return stats
+
+    def summary(self, rule_names=None):
+        """Rows with failure rate and solve-time quantiles, sorted by key"""
+        rule_names = rule_names or {}
+        rows = []
+        with self._lock:
+            for (rule, band, mode), cell in sorted(self._cells.items()):
+                sketch = cell.solve_times
+                rows.append({
+                    'rule': rule,
+                    'rule_name': rule_names.get(rule, rule),
+                    'level_band': band,
+                    'mode': mode,
+                    'attempts': cell.attempts,
+                    'failures': cell.failures,
+                    'failure_rate': round(cell.failures / cell.attempts, 4) if cell.attempts else 0.0,
+                    'solve_time': {
+                        'count': sketch.count,
+                        'mean': round(sketch.total / sketch.count, 3) if sketch.count else None,
+                        'p50': _round(sketch.quantile(0.5)),
+                        'p90': _round(sketch.quantile(0.9)),
+                        'p99': _round(sketch.quantile(0.99))
+                    }
+                })
+        return rows
+
+
+def _round(value):
+    return round(value, 3) if value is not None else None
+
+
+class WorkerSolveStats:
+    """This worker's SolveStats plus periodic snapshots and a cached global merge"""
+
+    def __init__(self, stats_dir=None, flush_interval=10.0, cache_ttl=10.0, stale_after=300.0):
+        self.stats_dir = stats_dir or default_stats_dir()
+        self.flush_interval = flush_interval
+        self.cache_ttl = cache_ttl
+        self.stale_after = stale_after
+        self.local = SolveStats()
+        # pid + start time keeps a restarted worker from overwriting an older snapshot
+        self.snapshot_path = os.path.join(
+            self.stats_dir, f"{SNAPSHOT_PREFIX}{os.getpid()}-{int(time.time() * 1000)}{SNAPSHOT_SUFFIX}")
+        self._dirty = False
+        self._cache = None
+        self._cache_time = 0.0
+        self._cache_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def record(self, rule, level, mode, time_taken, correct):
+        self.local.record(rule, level, mode, time_taken, correct)
+        self._dirty = True
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='solve-stats-flusher', daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.flush_interval)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+            self.compact()
+
+    def flush(self):
+        """Write this worker's snapshot atomically if anything changed, else refresh its mtime"""
+        if not self._dirty:
+            try:
+                os.utime(self.snapshot_path)
+            except OSError:
+                pass
+            return
+        self._dirty = False
+        data = self.local.to_dict()
+        try:
+            os.makedirs(self.stats_dir, exist_ok=True)
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError:
+            self._dirty = True
+
+    def _other_snapshots(self):
+        try:
+            names = os.listdir(self.stats_dir)
+        except FileNotFoundError:
+            return []
+        own = os.path.basename(self.snapshot_path)
+        return [name for name in names
+                if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX) and name != own]
+
+    def compact(self):
+        """Fold snapshots not refreshed within stale_after into this worker's counters
+
+        Each stale file is claimed with an atomic rename, so only one worker
+        absorbs it. The claimed file is deleted once this worker's own snapshot
+        (now including it) has been written. Returns the number absorbed.
+        """
+        cutoff = time.time() - self.stale_after
+        claimed = []
+        for name in self._other_snapshots():
+            path = os.path.join(self.stats_dir, name)
+            claim = f"{path}.{os.getpid()}.claimed"
+            try:
+                if os.path.getmtime(path) > cutoff:
+                    continue
+                os.rename(path, claim)
+            except OSError:
+                # Already gone, or another worker claimed it first
+                continue
+            try:
+                with open(claim, 'r') as f:
+                    self.local.merge(SolveStats.from_dict(json.load(f)))
+            except (OSError, ValueError, KeyError):
+                pass
+            claimed.append(claim)
+        if claimed:
+            self._dirty = True
+            self.flush()
+            for claim in claimed:
+                try:
+                    os.remove(claim)
+                except OSError:
+                    pass
+        return len(claimed)
+
+    def merged(self):
+        """Every worker's snapshot merged with this worker's live counters"""
+        merged = SolveStats().merge(self.local)
+        for name in self._other_snapshots():
+            try:
+                with open(os.path.join(self.stats_dir, name), 'r') as f:
+                    merged.merge(SolveStats.from_dict(json.load(f)))
+            except (OSError, ValueError, KeyError):
+                continue
+        return merged
+
+    def global_summary(self, rule_names=None):
+        """Merged summary, recomputed at most once per cache_ttl"""
+        with self._cache_lock:
+            now = time.monotonic()
+            if self._cache is None or now - self._cache_time >= self.cache_ttl:
+                self._cache = {
+                    'generated_at': int(time.time()),
+                    'rules': self.merged().summary(rule_names)
+                }
+                self._cache_time = now
+            return self._cache
@@ -0,0 +1,187 @@
+// --- Battle Mode (loaded on demand by script.js) ---
+let ctx = null;
+let battleType = null; // 'multiplayer' or 'ai'
+let battlePlayerScore = 0;
+let battleOpponentScore = 0;
+let battleRounds = 5;
+let battleCurrentRound = 0;
+let battleOpponentName = '';
+
+export function openModal() {
+  document.getElementById("battle-modal").style.display = "flex";
+  document.getElementById("battle-status").textContent = "";
+}
+
+export function init(context) {
+  ctx = context;
+
+  const battleModal = document.getElementById("battle-modal");
+  const closeBattleModal = document.getElementById("close-battle-modal");
+  const findPlayerBtn = document.getElementById("find-player-btn");
+  const playAiBtn = document.getElementById("play-ai-btn");
+  const battleStatus = document.getElementById("battle-status");
+
+  if (closeBattleModal) {
+    closeBattleModal.onclick = () => {
+      battleModal.style.display = "none";
+    };
+  }
+  if (findPlayerBtn) {
+    findPlayerBtn.onclick = () => {
+      battleStatus.textContent = "Searching for another player... (simulated)";
+      setTimeout(() => {
+        battleStatus.textContent = "Player found! Starting battle...";
+        setTimeout(() => {
+          battleModal.style.display = "none";
+          // Start multiplayer battle (simulate for now)
+          startBattle({ mode: "multiplayer" });
+        }, 1200);
+      }, 1500);
+    };
+  }
+  if (playAiBtn) {
+    playAiBtn.onclick = () => {
+      battleStatus.textContent = "Starting battle vs Computer...";
+      setTimeout(() => {
+        battleModal.style.display = "none";
+        startBattle({ mode: "ai" });
+      }, 1000);
+    };
+  }
+
+  // Add modal to show battle results
+  if (!document.getElementById('battle-result-modal')) {
+    const modal = document.createElement('div');
+    modal.id = 'battle-result-modal';
+    modal.className = 'modal';
+    modal.style.display = 'none';
+    modal.innerHTML = `
+      <div class="modal-content">
+        <span class="modal-close" id="close-battle-result-modal">&times;</span>
+        <h2 id="battle-result-title">Battle Result</h2>
+        <div id="battle-result-summary"></div>
+        <button id="battle-rematch-btn" class="primary-btn">Rematch</button>
+        <button id="battle-exit-btn" class="secondary-btn">Exit</button>
+      </div>
+    `;
+    document.body.appendChild(modal);
+    document.getElementById('close-battle-result-modal').onclick = () => { modal.style.display = 'none'; };
+    document.getElementById('battle-exit-btn').onclick = () => { modal.style.display = 'none'; document.getElementById('start-screen').style.display = 'flex'; document.getElementById('game-card').style.display = 'none'; };
+    document.getElementById('battle-rematch-btn').onclick = () => { modal.style.display = 'none'; startBattle({ mode: battleType }); };
+  }
+}
+
+function showBattleResult() {
+  const modal = document.getElementById('battle-result-modal');
+  const title = document.getElementById('battle-result-title');
+  const summary = document.getElementById('battle-result-summary');
+  let result = '';
+  if (battlePlayerScore > battleOpponentScore) {
+    result = '🏆 You Win!';
+  } else if (battlePlayerScore < battleOpponentScore) {
+    result = `😢 You Lose!`;
+  } else {
+    result = '🤝 It\'s a Draw!';
+  }
+  title.textContent = 'Battle Result';
+  summary.innerHTML = `
+    <p>${result}</p>
+    <p>Your Score: <b>${battlePlayerScore}</b></p>
+    <p>${battleOpponentName} Score: <b>${battleOpponentScore}</b></p>
+  `;
+  modal.style.display = 'flex';
+}
+
+function startBattle({ mode }) {
+  ctx.battleActive = true;
+  battleType = mode;
+  battlePlayerScore = 0;
+  battleOpponentScore = 0;
+  battleCurrentRound = 0;
+  battleRounds = 5;
+  battleOpponentName = mode === 'multiplayer' ? 'Opponent' : 'Computer';
+  document.getElementById('start-screen').style.display = 'none';
+  document.getElementById('game-card').style.display = 'block';
+  document.getElementById('level-score').textContent = `Battle: You vs ${battleOpponentName}`;
+  ctx.selectedMode = 'classic';
+  fetch('/api/mode', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ mode: ctx.selectedMode })
+  })
+    .then(response => response.json())
+    .then(data => {
+      if (data.status === 'success') {
+        nextBattleRound();
+      }
+    });
+}
+
+function nextBattleRound() {
+  battleCurrentRound++;
+  if (battleCurrentRound > battleRounds) {
+    showBattleResult();
+    ctx.battleActive = false;
+    return;
+  }
+  // Show round info
+  ctx.setFeedback(`Round ${battleCurrentRound} of ${battleRounds}`);
+  // Load a new challenge for the player
+  fetch('/api/challenge')
+    .then(res => res.json())
+    .then(data => {
+      ctx.challengeToken = data.token || null;
+      ctx.seqDisplay.textContent = data.sequence.join(' ');
+      document.getElementById('level-score').textContent = `Battle: You vs ${battleOpponentName} | Round ${battleCurrentRound}`;
+      document.getElementById('hint-message').textContent = data.hint;
+      ctx.setScoreboard(data.level, data.score);
+      ctx.setFeedback(`Round ${battleCurrentRound} of ${battleRounds}`);
+      // Reset and re-enable all game elements
+      const answerInput = document.getElementById('answer-input');
+      const submitBtn = document.getElementById('submit-btn');
+      const quitBtn = document.getElementById('quit-btn');
+      const restartBtn = document.getElementById('restart-btn');
+      answerInput.disabled = false;
+      answerInput.value = '';
+      submitBtn.disabled = false;
+      quitBtn.disabled = false;
+      restartBtn.style.display = 'none';
+      ctx.gameOver = false;
+      // Simulate opponent/AI answer
+      simulateOpponentAnswer(data.correct_answer);
+    });
+}
+
+// Simulate opponent/AI answer (randomly correct or not, with random time)
+function simulateOpponentAnswer(correctAnswer) {
+  // For AI: 70% chance to be correct, for multiplayer: 50%
+  const isCorrect = battleType === 'ai' ? Math.random() < 0.7 : Math.random() < 0.5;
+  const delay = 1200 + Math.random() * 1800;
+  setTimeout(() => {
+    if (isCorrect) {
+      battleOpponentScore += 100 + Math.floor(Math.random() * 100);
+    }
+    // If player hasn't answered in time, nothing happens (player must submit)
+  }, delay);
+}
+
+// Called by the main answer handler while a battle is running
+export function onAnswer(data) {
+  const card = document.getElementById("game-card");
+  if (data.game_over) {
+    ctx.setFeedback(data.message);
+    ctx.playSound("wrong");
+    card.classList.add("shake");
+  } else {
+    ctx.setFeedback(data.message);
+    ctx.playSound("correct");
+    ctx.confetti();
+    card.classList.add("glow");
+    setTimeout(() => card.classList.remove("glow"), 800);
+    battlePlayerScore += 100 + Math.floor(Math.random() * 100);
+  }
+  // Always go to next round in battle mode
+  setTimeout(() => {
+    nextBattleRound();
+  }, 1200);
+}
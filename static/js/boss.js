@@ -0,0 +1,157 @@
+// --- Boss Battle System (loaded on demand by script.js) ---
+let ctx = null;
+let bossSequences = [];
+let bossCurrentIndex = 0;
+let bossTimerInterval = null;
+
+export function start(level) {
+  console.log("Starting boss battle for level", level);
+
+  // Show boss overlay
+  const bossOverlay = document.getElementById('boss-overlay');
+  document.getElementById('boss-level-num').textContent = level;
+  bossOverlay.style.display = 'flex';
+
+  // Fetch boss sequences
+  fetch('/api/boss/start', { method: 'POST' })
+    .then(res => res.json())
+    .then(data => {
+      bossSequences = data.sequences;
+      bossCurrentIndex = 0;
+
+      // Start boss timer (30 seconds total)
+      startBossTimer(30);
+
+      // Load first sequence
+      loadBossSequence(0);
+
+      ctx.playSound('warning');
+    })
+    .catch(err => {
+      console.error('Boss start error:', err);
+      bossOverlay.style.display = 'none';
+    });
+}
+
+function startBossTimer(seconds) {
+  let timeLeft = seconds;
+  const timerBar = document.getElementById('boss-timer-bar');
+  const timerText = document.getElementById('boss-timer-text');
+
+  timerBar.style.width = '100%';
+  timerText.textContent = timeLeft;
+
+  if (bossTimerInterval) clearInterval(bossTimerInterval);
+
+  bossTimerInterval = setInterval(() => {
+    timeLeft--;
+    const percentage = (timeLeft / seconds) * 100;
+    timerBar.style.width = percentage + '%';
+    timerText.textContent = timeLeft;
+
+    if (timeLeft <= 5) {
+      ctx.playSound('warning');
+    }
+
+    if (timeLeft <= 0) {
+      clearInterval(bossTimerInterval);
+      reportBossTimeout();
+      bossFailed('⏰ Time\'s up! Boss Battle Failed!');
+    }
+  }, 1000);
+}
+
+function loadBossSequence(index) {
+  if (index >= bossSequences.length) return;
+
+  const seq = bossSequences[index];
+  document.getElementById('boss-sequence').textContent = seq.sequence.join(' ');
+  document.getElementById('boss-hint').textContent = seq.hint;
+  document.getElementById('boss-progress-text').textContent = `${index}/3`;
+  document.getElementById('boss-feedback').textContent = '';
+  document.getElementById('boss-answer-input').value = '';
+  document.getElementById('boss-answer-input').focus();
+}
+
+function reportBossTimeout() {
+  // Let the server end the battle and count the unanswered sequence as failed
+  fetch('/api/boss/timeout', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ token: bossSequences[bossCurrentIndex]?.token })
+  }).catch(err => console.error('Boss timeout error:', err));
+}
+
+function bossFailed(message) {
+  clearInterval(bossTimerInterval);
+  document.getElementById('boss-feedback').textContent = message;
+  document.getElementById('boss-submit-btn').disabled = true;
+  ctx.playSound('wrong');
+
+  setTimeout(() => {
+    document.getElementById('boss-overlay').style.display = 'none';
+    const finalScore = parseInt(document.getElementById('level-score').textContent.match(/Score: (\d+)/)?.[1] || 0);
+    ctx.disableGame(finalScore);
+  }, 2000);
+}
+
+function bossVictory() {
+  clearInterval(bossTimerInterval);
+  document.getElementById('boss-feedback').innerHTML = '🎉 <span class="boss-victory">BOSS DEFEATED!</span> 🎉';
+  document.getElementById('boss-submit-btn').disabled = true;
+  ctx.playSound('achievement');
+  ctx.confetti();
+
+  setTimeout(() => {
+    document.getElementById('boss-overlay').style.display = 'none';
+    ctx.loadFeature('shop').then(shop => shop.refresh()); // Update bytes
+    ctx.loadChallenge(); // Load next level
+  }, 2500);
+}
+
+export function init(context) {
+  ctx = context;
+
+  // Boss answer form handler
+  const bossAnswerForm = document.getElementById('boss-answer-form');
+  console.log('Boss answer form:', bossAnswerForm);
+  if (bossAnswerForm) {
+    bossAnswerForm.addEventListener('submit', function (e) {
+      e.preventDefault();
+      console.log('Boss form submitted!');
+
+      const answer = document.getElementById('boss-answer-input').value.trim();
+      if (!answer) return;
+
+      document.getElementById('boss-submit-btn').disabled = true;
+
+      fetch('/api/boss/answer', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ answer, token: bossSequences[bossCurrentIndex]?.token })
+      })
+        .then(res => res.json())
+        .then(data => {
+          if (data.boss_defeated) {
+            bossVictory();
+          } else if (data.correct) {
+            // Correct, move to next sequence
+            document.getElementById('boss-feedback').textContent = data.message;
+            ctx.playSound('correct');
+            bossCurrentIndex++;
+            setTimeout(() => {
+              loadBossSequence(bossCurrentIndex);
+              document.getElementById('boss-submit-btn').disabled = false;
+            }, 800);
+          } else {
+            // Wrong answer - boss battle failed
+            bossFailed(data.message);
+          }
+        })
+        .catch(err => {
+          console.error('Boss answer error:', err);
+          document.getElementById('boss-submit-btn').disabled = false;
+        });
+    });
+  }
+}
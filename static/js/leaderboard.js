@@ -0,0 +1,24 @@
+// --- Dynamic Leaderboard (loaded on demand by script.js) ---
+let ctx = null;
+
+export function init(context) {
+  ctx = context;
+}
+
+export function refresh() {
+  return fetch("/api/leaderboard")
+    .then(res => res.json())
+    .then(data => {
+      const list = document.getElementById("leaderboard-list");
+      if (list) {
+        if (data.length === 0) {
+          list.innerHTML = "<li>No scores yet</li>";
+        } else {
+          list.innerHTML = data.slice(0, 10).map(entry =>
+            `<li>${entry.name} - ${entry.score} <span style='color:#78909c'>(${entry.mode} mode)</span></li>`
+          ).join("");
+        }
+      }
+    })
+    .catch(err => console.error("Error fetching leaderboard:", err));
+}
@@ -0,0 +1,135 @@
+// --- Shop System (loaded on demand by script.js) ---
+let ctx = null;
+let currentBytes = 0;
+let currentPowerUps = { time_freeze: 0, debugger: 0, skip: 0 };
+
+function updateShopUI() {
+  // Update bytes display
+  document.getElementById('bytes-count').textContent = currentBytes;
+  document.getElementById('shop-bytes').textContent = currentBytes;
+
+  // Update owned counts in shop
+  document.querySelectorAll('.power-up-card').forEach(card => {
+    const powerup = card.dataset.powerup;
+    const count = currentPowerUps[powerup] || 0;
+    card.querySelector('.owned-count').textContent = count;
+  });
+
+  // Update power-up buttons
+  document.getElementById('use-time-freeze').querySelector('.count').textContent = currentPowerUps.time_freeze || 0;
+  document.getElementById('use-debugger').querySelector('.count').textContent = currentPowerUps.debugger || 0;
+  document.getElementById('use-skip').querySelector('.count').textContent = currentPowerUps.skip || 0;
+
+  // Enable/disable buttons
+  document.getElementById('use-time-freeze').disabled = (currentPowerUps.time_freeze || 0) === 0;
+  document.getElementById('use-debugger').disabled = (currentPowerUps.debugger || 0) === 0;
+  document.getElementById('use-skip').disabled = (currentPowerUps.skip || 0) === 0;
+}
+
+export function refresh() {
+  return fetch('/api/shop/status')
+    .then(res => res.json())
+    .then(data => setStatus(data.bytes, data.power_ups));
+}
+
+export function setStatus(bytes, powerUps) {
+  currentBytes = bytes;
+  currentPowerUps = powerUps || currentPowerUps;
+  updateShopUI();
+}
+
+export function open() {
+  refresh();
+  document.getElementById('shop-modal').style.display = 'flex';
+}
+
+export function init(context) {
+  ctx = context;
+
+  const shopModal = document.getElementById('shop-modal');
+  const closeShopModal = document.getElementById('close-shop-modal');
+
+  if (closeShopModal) {
+    closeShopModal.addEventListener('click', () => {
+      shopModal.style.display = 'none';
+    });
+  }
+
+  // Purchase handlers
+  document.querySelectorAll('.buy-btn').forEach(btn => {
+    btn.addEventListener('click', function () {
+      const powerup = this.dataset.powerup;
+      this.disabled = true;
+
+      fetch('/api/shop/purchase', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ power_up: powerup })
+      })
+        .then(res => res.json())
+        .then(data => {
+          if (data.error) {
+            alert(data.error);
+          } else {
+            setStatus(data.bytes, data.power_ups);
+            ctx.playSound('correct');
+          }
+          this.disabled = false;
+        })
+        .catch(err => {
+          console.error('Purchase error:', err);
+          this.disabled = false;
+        });
+    });
+  });
+
+  // Power-up activation handlers
+  document.getElementById('use-time-freeze').addEventListener('click', function () {
+    if (currentPowerUps.time_freeze > 0) {
+      // Add 10 seconds to timer
+      const countdown = document.getElementById('timer-countdown');
+      const currentTime = parseInt(countdown.textContent);
+      countdown.textContent = currentTime + 10;
+
+      currentPowerUps.time_freeze--;
+      updateShopUI();
+      ctx.playSound('achievement');
+      ctx.setFeedback('⏱️ +10 seconds added!');
+    }
+  });
+
+  document.getElementById('use-debugger').addEventListener('click', function () {
+    if (currentPowerUps.debugger > 0) {
+      // The server spends the charge and reveals one digit of the answer
+      fetch('/api/powerup/debugger', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ token: ctx.challengeToken })
+      })
+        .then(res => res.json())
+        .then(data => {
+          if (data.error) {
+            ctx.setFeedback(data.error);
+            return;
+          }
+          setStatus(currentBytes, data.power_ups);
+          ctx.setFeedback(`🔍 Hint: The answer contains the digit "${data.digit}"`);
+          ctx.playSound('achievement');
+        })
+        .catch(err => console.error('Debugger error:', err));
+    }
+  });
+
+  document.getElementById('use-skip').addEventListener('click', function () {
+    if (currentPowerUps.skip > 0) {
+      currentPowerUps.skip--;
+      updateShopUI();
+      ctx.playSound('achievement');
+      ctx.setFeedback('⏭️ Skipping level...');
+      ctx.stopTimer();
+      setTimeout(() => {
+        ctx.loadChallenge();
+      }, 800);
+    }
+  });
+}
@@ -368,6 +368,9 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   }
 
+  // Signed token for the challenge on screen; the server checks answers against it
+  let currentChallengeToken = null;
+
   function loadChallenge() {
     console.log("Loading challenge...");
     fetch("/api/challenge")
@@ -377,11 +380,13 @@ document.addEventListener("DOMContentLoaded", () => {
 
         // Check if this is a boss battle
         if (data.is_boss) {
-          startBossBattle(data.level);
+          loadFeature("boss").then((boss) => boss.start(data.level));
           return;
         }
 
         try {
+          currentChallengeToken = data.token || null;
+
           // Update sequence display
           if (seqDisplay) seqDisplay.textContent = data.sequence ? data.sequence.join(" ") : "";
 
@@ -425,7 +430,7 @@ document.addEventListener("DOMContentLoaded", () => {
           }
 
           startTimer(() => {
-            fetch("/api/last_answer")
+            fetch(`/api/last_answer?token=${encodeURIComponent(currentChallengeToken || "")}`)
               .then((res) => res.json())
               .then((data) => {
                 let answerMsg =
@@ -509,7 +514,7 @@ document.addEventListener("DOMContentLoaded", () => {
       .then(response => response.json())
       .then(data => {
         console.log("Score submitted:", data);
-        updateLeaderboard(); // Refresh leaderboard
+        loadFeature("leaderboard").then((leaderboard) => leaderboard.refresh());
       })
       .catch(error => console.error("Error submitting score:", error));
 
@@ -555,27 +560,6 @@ document.addEventListener("DOMContentLoaded", () => {
     updateStatsDisplay();
   }
 
-  function updateLeaderboard() {
-    fetch("/api/leaderboard")
-      .then(res => res.json())
-      .then(data => {
-        const list = document.getElementById("leaderboard-list");
-        if (list) {
-          if (data.length === 0) {
-            list.innerHTML = "<li>No scores yet</li>";
-          } else {
-            list.innerHTML = data.slice(0, 10).map(entry =>
-              `<li>${entry.name} - ${entry.score} <span style="font-size:0.8em;color:#888">(${entry.mode})</span></li>`
-            ).join("");
-          }
-        }
-      })
-      .catch(err => console.error("Error fetching leaderboard:", err));
-  }
-
-  // Call updateLeaderboard on load
-  updateLeaderboard();
-
   function showScoreHistory() {
     const recentScoresList = document.getElementById("recent-scores-list");
     const scores = JSON.parse(localStorage.getItem("scoreHistory") || "[]");
@@ -967,7 +951,7 @@ document.addEventListener("DOMContentLoaded", () => {
   if (answerFormEl) {
     answerFormEl.addEventListener("submit", function (event) {
       event.preventDefault();
-      if (gameOver && !isBattleMode) return;
+      if (gameOver && !featureContext.battleActive) return;
 
       const answerInput = document.getElementById("answer-input");
       const answer = answerInput.value.trim();
@@ -979,7 +963,7 @@ document.addEventListener("DOMContentLoaded", () => {
       fetch("/api/answer", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ answer }),
+        body: JSON.stringify({ answer, token: currentChallengeToken }),
       })
         .then((res) => {
           if (!res.ok) throw new Error("Network response was not ok");
@@ -993,23 +977,8 @@ document.addEventListener("DOMContentLoaded", () => {
           }
 
           // Battle Mode Logic
-          if (isBattleMode) {
-            if (data.game_over) {
-              setFeedback(data.message);
-              playSound("wrong");
-              document.getElementById("game-card").classList.add("shake");
-            } else {
-              setFeedback(data.message);
-              playSound("correct");
-              confetti();
-              document.getElementById("game-card").classList.add("glow");
-              setTimeout(() => document.getElementById("game-card").classList.remove("glow"), 800);
-              battlePlayerScore += 100 + Math.floor(Math.random() * 100);
-            }
-            // Always go to next round in battle mode
-            setTimeout(() => {
-              nextBattleRound();
-            }, 1200);
+          if (featureContext.battleActive) {
+            loadFeature("battle").then((battle) => battle.onAnswer(data));
             return;
           }
 
@@ -1023,7 +992,7 @@ document.addEventListener("DOMContentLoaded", () => {
             if (data.correct_answer !== undefined) {
               document.getElementById("feedback-message").innerHTML += `<br>Correct answer: <b>${data.correct_answer}</b>`;
             }
-            updateLeaderboard();
+            loadFeature("leaderboard").then((leaderboard) => leaderboard.refresh());
           } else {
             setFeedback(data.message);
             playSound("correct");
@@ -1033,9 +1002,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
             // Update bytes and power-ups if returned
             if (data.bytes !== undefined) {
-              currentBytes = data.bytes;
-              currentPowerUps = data.power_ups || currentPowerUps;
-              updateShopUI();
+              loadFeature("shop").then((shop) => shop.setStatus(data.bytes, data.power_ups));
             }
 
             // Show new achievements
@@ -1068,342 +1035,72 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   }
 
-  // --- Dynamic Leaderboard ---
-  function updateLeaderboard() {
-    fetch('/api/leaderboard')
-      .then(res => res.json())
-      .then(data => {
-        const leaderboard = document.querySelector('.sidebar ol');
-        if (leaderboard) {
-          leaderboard.innerHTML = data.slice(0, 10).map((entry, i) =>
-            `<li>${entry.name} - ${entry.score} <span style='color:#78909c'>(${entry.mode} mode)</span></li>`
-          ).join('');
-        }
-      });
-  }
-  // Update leaderboard on load
-  updateLeaderboard();
-
-  // --- Shop System ---
-  let currentBytes = 0;
-  let currentPowerUps = { time_freeze: 0, debugger: 0, skip: 0 };
-
-  function updateShopUI() {
-    // Update bytes display
-    document.getElementById('bytes-count').textContent = currentBytes;
-    document.getElementById('shop-bytes').textContent = currentBytes;
-
-    // Update owned counts in shop
-    document.querySelectorAll('.power-up-card').forEach(card => {
-      const powerup = card.dataset.powerup;
-      const count = currentPowerUps[powerup] || 0;
-      card.querySelector('.owned-count').textContent = count;
-    });
-
-    // Update power-up buttons
-    document.getElementById('use-time-freeze').querySelector('.count').textContent = currentPowerUps.time_freeze || 0;
-    document.getElementById('use-debugger').querySelector('.count').textContent = currentPowerUps.debugger || 0;
-    document.getElementById('use-skip').querySelector('.count').textContent = currentPowerUps.skip || 0;
-
-    // Enable/disable buttons
-    document.getElementById('use-time-freeze').disabled = (currentPowerUps.time_freeze || 0) === 0;
-    document.getElementById('use-debugger').disabled = (currentPowerUps.debugger || 0) === 0;
-    document.getElementById('use-skip').disabled = (currentPowerUps.skip || 0) === 0;
-  }
-
-  function fetchShopStatus() {
-    fetch('/api/shop/status')
-      .then(res => res.json())
-      .then(data => {
-        currentBytes = data.bytes;
-        currentPowerUps = data.power_ups;
-        updateShopUI();
-      });
-  }
-
-  // Shop modal handlers
-  const shopBtn = document.getElementById('shop-btn');
-  const shopModal = document.getElementById('shop-modal');
-  const closeShopModal = document.getElementById('close-shop-modal');
-
-  if (shopBtn) {
-    shopBtn.addEventListener('click', () => {
-      fetchShopStatus();
-      shopModal.style.display = 'flex';
-    });
-  }
-
-  if (closeShopModal) {
-    closeShopModal.addEventListener('click', () => {
-      shopModal.style.display = 'none';
-    });
-  }
-
-  // Purchase handlers
-  document.querySelectorAll('.buy-btn').forEach(btn => {
-    btn.addEventListener('click', function () {
-      const powerup = this.dataset.powerup;
-      this.disabled = true;
+  // --- Lazy Feature Modules ---
+  // Shop, boss battles, leaderboard and battle mode live in static/js/ and are
+  // imported on first use; they reach the core game through featureContext.
+  const features = {};
+  const featureContext = {
+    get gameOver() { return gameOver; },
+    set gameOver(value) { gameOver = value; },
+    get selectedMode() { return selectedMode; },
+    set selectedMode(value) { selectedMode = value; },
+    get challengeToken() { return currentChallengeToken; },
+    set challengeToken(value) { currentChallengeToken = value; },
+    battleActive: false,
+    seqDisplay,
+    loadChallenge: () => loadChallenge(),
+    loadFeature,
+    disableGame,
+    setFeedback,
+    setScoreboard,
+    playSound,
+    confetti,
+    stopTimer,
+    showNotification,
+  };
 
-      fetch('/api/shop/purchase', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ power_up: powerup })
-      })
-        .then(res => res.json())
-        .then(data => {
-          if (data.error) {
-            alert(data.error);
-          } else {
-            currentBytes = data.bytes;
-            currentPowerUps = data.power_ups;
-            updateShopUI();
-            playSound('correct');
-          }
-          this.disabled = false;
+  function loadFeature(name) {
+    if (!features[name]) {
+      features[name] = import(`/static/js/${name}.js`)
+        .then((module) => {
+          module.init(featureContext);
+          return module;
         })
-        .catch(err => {
-          console.error('Purchase error:', err);
-          this.disabled = false;
+        .catch((err) => {
+          delete features[name];
+          console.error(`Error loading ${name} module:`, err);
+          throw err;
         });
-    });
-  });
-
-  // Power-up activation handlers
-  document.getElementById('use-time-freeze').addEventListener('click', function () {
-    if (currentPowerUps.time_freeze > 0) {
-      // Add 10 seconds to timer
-      const countdown = document.getElementById('timer-countdown');
-      const currentTime = parseInt(countdown.textContent);
-      countdown.textContent = currentTime + 10;
-
-      currentPowerUps.time_freeze--;
-      updateShopUI();
-      playSound('achievement');
-      setFeedback('⏱️ +10 seconds added!');
     }
-  });
-
-  document.getElementById('use-debugger').addEventListener('click', function () {
-    if (currentPowerUps.debugger > 0) {
-      // Reveal one digit of the answer
-      fetch('/api/last_answer')
-        .then(res => res.json())
-        .then(data => {
-          if (data.last_answer !== null) {
-            const answer = String(data.last_answer);
-            const digit = answer[Math.floor(Math.random() * answer.length)];
-            setFeedback(`🔍 Hint: The answer contains the digit "${digit}"`);
-            playSound('achievement');
-          }
-        });
-
-      currentPowerUps.debugger--;
-      updateShopUI();
-    }
-  });
-
-  document.getElementById('use-skip').addEventListener('click', function () {
-    if (currentPowerUps.skip > 0) {
-      currentPowerUps.skip--;
-      updateShopUI();
-      playSound('achievement');
-      setFeedback('⏭️ Skipping level...');
-      stopTimer();
-      setTimeout(() => {
-        loadChallenge();
-      }, 800);
-    }
-  });
-
-  // Fetch shop status on load
-  fetchShopStatus();
-
-  // --- Boss Battle System ---
-  let bossSequences = [];
-  let bossCurrentIndex = 0;
-  let bossTimerInterval = null;
-
-  function startBossBattle(level) {
-    console.log("Starting boss battle for level", level);
-
-    // Show boss overlay
-    const bossOverlay = document.getElementById('boss-overlay');
-    document.getElementById('boss-level-num').textContent = level;
-    bossOverlay.style.display = 'flex';
-
-    // Fetch boss sequences
-    fetch('/api/boss/start', { method: 'POST' })
-      .then(res => res.json())
-      .then(data => {
-        bossSequences = data.sequences;
-        bossCurrentIndex = 0;
-
-        // Start boss timer (30 seconds total)
-        startBossTimer(30);
-
-        // Load first sequence
-        loadBossSequence(0);
-
-        playSound('warning');
-      })
-      .catch(err => {
-        console.error('Boss start error:', err);
-        bossOverlay.style.display = 'none';
-      });
+    return features[name];
   }
 
-  function startBossTimer(seconds) {
-    let timeLeft = seconds;
-    const timerBar = document.getElementById('boss-timer-bar');
-    const timerText = document.getElementById('boss-timer-text');
-
-    timerBar.style.width = '100%';
-    timerText.textContent = timeLeft;
-
-    if (bossTimerInterval) clearInterval(bossTimerInterval);
-
-    bossTimerInterval = setInterval(() => {
-      timeLeft--;
-      const percentage = (timeLeft / seconds) * 100;
-      timerBar.style.width = percentage + '%';
-      timerText.textContent = timeLeft;
-
-      if (timeLeft <= 5) {
-        playSound('warning');
-      }
-
-      if (timeLeft <= 0) {
-        clearInterval(bossTimerInterval);
-        bossFailed('⏰ Time\'s up! Boss Battle Failed!');
-      }
-    }, 1000);
+  function whenIdle(callback) {
+    if ("requestIdleCallback" in window) requestIdleCallback(callback, { timeout: 2000 });
+    else setTimeout(callback, 200);
   }
 
-  function loadBossSequence(index) {
-    if (index >= bossSequences.length) return;
-
-    const seq = bossSequences[index];
-    document.getElementById('boss-sequence').textContent = seq.sequence.join(' ');
-    document.getElementById('boss-hint').textContent = seq.hint;
-    document.getElementById('boss-progress-text').textContent = `${index}/3`;
-    document.getElementById('boss-feedback').textContent = '';
-    document.getElementById('boss-answer-input').value = '';
-    document.getElementById('boss-answer-input').focus();
-  }
-
-  function bossFailed(message) {
-    clearInterval(bossTimerInterval);
-    document.getElementById('boss-feedback').textContent = message;
-    document.getElementById('boss-submit-btn').disabled = true;
-    playSound('wrong');
-
-    setTimeout(() => {
-      document.getElementById('boss-overlay').style.display = 'none';
-      const finalScore = parseInt(document.getElementById('level-score').textContent.match(/Score: (\d+)/)?.[1] || 0);
-      disableGame(finalScore);
-    }, 2000);
-  }
-
-  function bossVictory() {
-    clearInterval(bossTimerInterval);
-    document.getElementById('boss-feedback').innerHTML = '🎉 <span class="boss-victory">BOSS DEFEATED!</span> 🎉';
-    document.getElementById('boss-submit-btn').disabled = true;
-    playSound('achievement');
-    confetti();
-
-    setTimeout(() => {
-      document.getElementById('boss-overlay').style.display = 'none';
-      fetchShopStatus(); // Update bytes
-      loadChallenge(); // Load next level
-    }, 2500);
-  }
-
-  // Boss answer form handler
-  const bossAnswerForm = document.getElementById('boss-answer-form');
-  console.log('Boss answer form:', bossAnswerForm);
-  if (bossAnswerForm) {
-    bossAnswerForm.addEventListener('submit', function (e) {
-      e.preventDefault();
-      console.log('Boss form submitted!');
+  document.getElementById("shop-btn")?.addEventListener("click", () => {
+    loadFeature("shop").then((shop) => shop.open());
+  });
 
-      const answer = document.getElementById('boss-answer-input').value.trim();
-      if (!answer) return;
+  document.getElementById("battle-btn")?.addEventListener("click", () => {
+    loadFeature("battle").then((battle) => battle.openModal());
+  });
 
-      document.getElementById('boss-submit-btn').disabled = true;
+  // The sidebar shows the leaderboard and bytes, so fetch those once the page is idle
+  whenIdle(() => {
+    loadFeature("leaderboard").then((leaderboard) => leaderboard.refresh());
+    loadFeature("shop").then((shop) => shop.refresh());
+  });
 
-      fetch('/api/boss/answer', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ answer })
-      })
-        .then(res => res.json())
-        .then(data => {
-          if (data.boss_defeated) {
-            bossVictory();
-          } else if (data.correct) {
-            // Correct, move to next sequence
-            document.getElementById('boss-feedback').textContent = data.message;
-            playSound('correct');
-            bossCurrentIndex++;
-            setTimeout(() => {
-              loadBossSequence(bossCurrentIndex);
-              document.getElementById('boss-submit-btn').disabled = false;
-            }, 800);
-          } else {
-            // Wrong answer - boss battle failed
-            bossFailed(data.message);
-          }
-        })
-        .catch(err => {
-          console.error('Boss answer error:', err);
-          document.getElementById('boss-submit-btn').disabled = false;
-        });
+  // --- Offline cache for the static shell and feature modules ---
+  if ("serviceWorker" in navigator) {
+    window.addEventListener("load", () => {
+      navigator.serviceWorker.register("/sw.js").catch((err) => console.error("Service worker registration failed:", err));
     });
   }
 
-  // --- Battle Mode UI Logic ---
-  const battleBtn = document.getElementById("battle-btn");
-  const battleModal = document.getElementById("battle-modal");
-  const closeBattleModal = document.getElementById("close-battle-modal");
-  const findPlayerBtn = document.getElementById("find-player-btn");
-  const playAiBtn = document.getElementById("play-ai-btn");
-  const battleStatus = document.getElementById("battle-status");
-
-  if (battleBtn && battleModal) {
-    battleBtn.onclick = () => {
-      battleModal.style.display = "flex";
-      battleStatus.textContent = "";
-    };
-  }
-  if (closeBattleModal) {
-    closeBattleModal.onclick = () => {
-      battleModal.style.display = "none";
-    };
-  }
-  if (findPlayerBtn) {
-    findPlayerBtn.onclick = () => {
-      battleStatus.textContent = "Searching for another player... (simulated)";
-      setTimeout(() => {
-        battleStatus.textContent = "Player found! Starting battle...";
-        setTimeout(() => {
-          battleModal.style.display = "none";
-          // Start multiplayer battle (simulate for now)
-          startBattle({ mode: "multiplayer" });
-        }, 1200);
-      }, 1500);
-    };
-  }
-  if (playAiBtn) {
-    playAiBtn.onclick = () => {
-      battleStatus.textContent = "Starting battle vs Computer...";
-      setTimeout(() => {
-        battleModal.style.display = "none";
-        startBattle({ mode: "ai" });
-      }, 1000);
-    };
-  }
-
   // --- Fun Fact Modal Logic ---
   const funfactModal = document.getElementById("funfact-modal");
   const closeFunfactModal = document.getElementById("close-funfact-modal");
@@ -1436,160 +1133,4 @@ document.addEventListener("DOMContentLoaded", () => {
     }, 1200);
   };
 
-  // --- Battle Logic (Improved) ---
-  let isBattleMode = false;
-  let battleType = null; // 'multiplayer' or 'ai'
-
-  function startBattle({ mode }) {
-    isBattleMode = true;
-    battleType = mode;
-    // Hide start screen, show game card, reset state
-    document.getElementById('start-screen').style.display = 'none';
-    document.getElementById('game-card').style.display = 'block';
-    // Optionally, show a battle indicator
-    document.getElementById('level-score').textContent =
-      mode === 'multiplayer' ? 'Battle: You vs Player' : 'Battle: You vs Computer';
-    // Set up game mode (use classic for now, or extend for battle logic)
-    selectedMode = 'classic';
-    fetch('/api/mode', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ mode: selectedMode })
-    })
-      .then(response => response.json())
-      .then(data => {
-        if (data.status === 'success') {
-          loadChallenge();
-          showScoreHistory();
-          updateStatsDisplay();
-        }
-      });
-    // TODO: For real multiplayer, sync state with server; for AI, simulate AI moves.
-  }
-
-  // --- Battle Result Modal ---
-  let battlePlayerScore = 0;
-  let battleOpponentScore = 0;
-  let battleRounds = 5;
-  let battleCurrentRound = 0;
-  let battleOpponentName = '';
-
-  // Add modal to show battle results
-  if (!document.getElementById('battle-result-modal')) {
-    const modal = document.createElement('div');
-    modal.id = 'battle-result-modal';
-    modal.className = 'modal';
-    modal.style.display = 'none';
-    modal.innerHTML = `
-      <div class="modal-content">
-        <span class="modal-close" id="close-battle-result-modal">&times;</span>
-        <h2 id="battle-result-title">Battle Result</h2>
-        <div id="battle-result-summary"></div>
-        <button id="battle-rematch-btn" class="primary-btn">Rematch</button>
-        <button id="battle-exit-btn" class="secondary-btn">Exit</button>
-      </div>
-    `;
-    document.body.appendChild(modal);
-    document.getElementById('close-battle-result-modal').onclick = () => { modal.style.display = 'none'; };
-    document.getElementById('battle-exit-btn').onclick = () => { modal.style.display = 'none'; document.getElementById('start-screen').style.display = 'flex'; document.getElementById('game-card').style.display = 'none'; };
-    document.getElementById('battle-rematch-btn').onclick = () => { modal.style.display = 'none'; startBattle({ mode: battleType }); };
-  }
-
-  function showBattleResult() {
-    const modal = document.getElementById('battle-result-modal');
-    const title = document.getElementById('battle-result-title');
-    const summary = document.getElementById('battle-result-summary');
-    let result = '';
-    if (battlePlayerScore > battleOpponentScore) {
-      result = '🏆 You Win!';
-    } else if (battlePlayerScore < battleOpponentScore) {
-      result = `😢 You Lose!`;
-    } else {
-      result = '🤝 It\'s a Draw!';
-    }
-    title.textContent = 'Battle Result';
-    summary.innerHTML = `
-      <p>${result}</p>
-      <p>Your Score: <b>${battlePlayerScore}</b></p>
-      <p>${battleOpponentName} Score: <b>${battleOpponentScore}</b></p>
-    `;
-    modal.style.display = 'flex';
-  }
-
-  // --- Enhanced Battle Logic ---
-  function startBattle({ mode }) {
-    isBattleMode = true;
-    battleType = mode;
-    battlePlayerScore = 0;
-    battleOpponentScore = 0;
-    battleCurrentRound = 0;
-    battleRounds = 5;
-    battleOpponentName = mode === 'multiplayer' ? 'Opponent' : 'Computer';
-    document.getElementById('start-screen').style.display = 'none';
-    document.getElementById('game-card').style.display = 'block';
-    document.getElementById('level-score').textContent = `Battle: You vs ${battleOpponentName}`;
-    selectedMode = 'classic';
-    fetch('/api/mode', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ mode: selectedMode })
-    })
-      .then(response => response.json())
-      .then(data => {
-        if (data.status === 'success') {
-          nextBattleRound();
-        }
-      });
-  }
-
-  function nextBattleRound() {
-    battleCurrentRound++;
-    if (battleCurrentRound > battleRounds) {
-      showBattleResult();
-      isBattleMode = false;
-      return;
-    }
-    // Show round info
-    setFeedback(`Round ${battleCurrentRound} of ${battleRounds}`);
-    // Load a new challenge for the player
-    fetch('/api/challenge')
-      .then(res => res.json())
-      .then(data => {
-        seqDisplay.textContent = data.sequence.join(' ');
-        document.getElementById('level-score').textContent = `Battle: You vs ${battleOpponentName} | Round ${battleCurrentRound}`;
-        document.getElementById('hint-message').textContent = data.hint;
-        setScoreboard(data.level, data.score);
-        setFeedback(`Round ${battleCurrentRound} of ${battleRounds}`);
-        // Reset and re-enable all game elements
-        const answerInput = document.getElementById('answer-input');
-        const submitBtn = document.getElementById('submit-btn');
-        const quitBtn = document.getElementById('quit-btn');
-        const restartBtn = document.getElementById('restart-btn');
-        answerInput.disabled = false;
-        answerInput.value = '';
-        submitBtn.disabled = false;
-        quitBtn.disabled = false;
-        restartBtn.style.display = 'none';
-        gameOver = false;
-        // Simulate opponent/AI answer
-        simulateOpponentAnswer(data.correct_answer);
-      });
-  }
-
-  // Simulate opponent/AI answer (randomly correct or not, with random time)
-  function simulateOpponentAnswer(correctAnswer) {
-    // For AI: 70% chance to be correct, for multiplayer: 50%
-    const isCorrect = battleType === 'ai' ? Math.random() < 0.7 : Math.random() < 0.5;
-    const delay = 1200 + Math.random() * 1800;
-    setTimeout(() => {
-      if (isCorrect) {
-        battleOpponentScore += 100 + Math.floor(Math.random() * 100);
-      }
-      // If player hasn't answered in time, nothing happens (player must submit)
-    }, delay);
-  }
-
-  // Patch answer form submit for battle mode - MERGED into main handler
-  // The logic is now handled in the main submit handler above by checking isBattleMode
-
 });
@@ -0,0 +1,69 @@
+// Sequence Master service worker
+// Lets the game page open offline with its sounds, logo and fun facts.
+//
+// Install precaches only the page shell and those assets. It reads them with
+// "force-cache", so anything the page has just loaded comes from the browser's
+// HTTP cache instead of being downloaded a second time. Feature modules are
+// cached only once the page actually loads them.
+//
+// Requests go to the network first while online, so after a deploy returning
+// users get the current core script and feature modules (which share the
+// featureContext interface). The cache is only the offline fallback.
+//
+// /sw.js is served by app.py, which fills in ASSET_VERSION from a hash of the
+// static files; every release therefore installs into a fresh cache and the
+// old one is dropped on activate.
+
+const ASSET_VERSION = "__ASSET_VERSION__";
+const CACHE_NAME = `sequence-master-assets-${ASSET_VERSION}`;
+
+const OFFLINE_ASSETS = [
+  "/",
+  "/static/styles.css",
+  "/static/script.js",
+  "/static/funfact.html",
+  "/static/images/logo.png",
+  "/static/sounds/achievement.mp3",
+  "/static/sounds/correct.mp3",
+  "/static/sounds/timeout.mp3",
+  "/static/sounds/warning.mp3",
+  "/static/sounds/wrong.mp3",
+];
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(
+    caches.open(CACHE_NAME)
+      .then((cache) => cache.addAll(
+        OFFLINE_ASSETS.map((path) => new Request(path, { cache: "force-cache" }))
+      ))
+      .then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    caches.keys()
+      .then((names) => Promise.all(
+        names.filter((name) => name !== CACHE_NAME).map((name) => caches.delete(name))
+      ))
+      .then(() => self.clients.claim())
+  );
+});
+
+self.addEventListener("fetch", (event) => {
+  const url = new URL(event.request.url);
+  if (event.request.method !== "GET" || url.origin !== self.location.origin) return;
+  if (url.pathname !== "/" && !url.pathname.startsWith("/static/")) return;
+
+  // Network-first; keep what the page really used as the offline copy
+  event.respondWith(
+    caches.open(CACHE_NAME).then((cache) =>
+      fetch(event.request)
+        .then((response) => {
+          if (response.ok) cache.put(event.request, response.clone());
+          return response;
+        })
+        .catch(() => cache.match(event.request).then((cached) => cached || Response.error()))
+    )
+  );
+});
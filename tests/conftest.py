@@ -0,0 +1,27 @@
+"""
+Test setup shared by every test module
+Points the app's runtime data (analytics events, solve-stats snapshots, score
+history) at a temporary directory before any test module imports `app`, so
+test traffic never lands in the real data/ directory.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+TEST_DATA_DIR = tempfile.mkdtemp(prefix='sequence-master-tests-')
+TEST_DATA_ENV = {
+    'SEQUENCE_MASTER_EVENTS_DIR': os.path.join(TEST_DATA_DIR, 'events'),
+    'SEQUENCE_MASTER_STATS_DIR': os.path.join(TEST_DATA_DIR, 'stats'),
+    'SEQUENCE_MASTER_SCORE_HISTORY': os.path.join(TEST_DATA_DIR, 'score_history.jsonl'),
+}
+os.environ.update(TEST_DATA_ENV)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    # Stop the app's background writers first so nothing recreates the directory
+    app_module = sys.modules.get('app')
+    if app_module is not None:
+        app_module.event_log.close()
+        app_module.solve_stats.close()
+    shutil.rmtree(TEST_DATA_DIR, ignore_errors=True)
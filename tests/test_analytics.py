@@ -0,0 +1,72 @@
+import unittest
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import EventLog, iter_events, iter_segments, aggregate
+
+class TestEventLog(unittest.TestCase):
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def test_events_flushed_and_aggregated(self):
+        """Test that queued events reach disk and aggregate per group"""
+        log = EventLog(log_dir=self.log_dir, batch_size=3, flush_interval=0.05).start()
+        for i in range(10):
+            log.record('answer', rule_set=1, level=2, mode='classic',
+                       time_taken=float(i), correct=i % 2 == 0)
+        log.record('game_over', mode='classic', level=2, score=100)
+        log.close()
+
+        self.assertEqual(log.stats()['written'], 11)
+        events = list(iter_events(self.log_dir))
+        self.assertEqual(len(events), 11)
+
+        rows = aggregate(events)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['attempts'], 10)
+        self.assertEqual(rows[0]['accuracy'], 0.5)
+        self.assertEqual(rows[0]['avg_time'], 4.5)
+
+    def test_aggregate_sorts_levels_numerically(self):
+        """Test that groups sort by value, not by string (level 2 before 10), with None last"""
+        events = [{'type': 'answer', 'rule_set': 1, 'level': level, 'mode': 'classic',
+                   'time_taken': 1.0, 'correct': True} for level in (10, 2, None, 1)]
+        self.assertEqual([r['level'] for r in aggregate(events)], [1, 2, 10, None])
+
+    def test_drops_counted_when_queue_full(self):
+        """Test that a full queue drops events instead of blocking"""
+        log = EventLog(log_dir=self.log_dir, max_queue=5)
+        results = [log.record('answer', correct=True) for _ in range(8)]
+        self.assertEqual(results.count(False), 3)
+        self.assertEqual(log.stats()['dropped'], 3)
+        log.close()
+        self.assertEqual(len(list(iter_events(self.log_dir))), 5)
+
+    def test_segments_rotate(self):
+        """Test that segments rotate once they pass the size limit"""
+        log = EventLog(log_dir=self.log_dir, batch_size=1, segment_max_bytes=1)
+        for i in range(3):
+            log.record('answer', level=i)
+            log.close()
+        self.assertEqual(len(list(iter_segments(self.log_dir))), 3)
+
+    def test_truncated_segment_is_skipped(self):
+        """Test that a corrupt tail does not break the scan"""
+        log = EventLog(log_dir=self.log_dir)
+        log.record('answer', level=1)
+        log.close()
+        path = next(iter_segments(self.log_dir))
+        with open(path, 'ab') as f:
+            f.write(gzip.compress(b'{"type":"answer"}\n')[:10])
+        self.assertEqual(len(list(iter_events(self.log_dir))), 1)
+
+if __name__ == '__main__':
+    unittest.main()
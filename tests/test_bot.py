@@ -0,0 +1,60 @@
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sequenceMaster import SequenceMasterV2
+from bot import SequenceBot, play_one, run_benchmark
+
+class TestHeadlessPlay(unittest.TestCase):
+    def test_play_with_scripted_io(self):
+        """Test that play() runs on injected input/output"""
+        game = SequenceMasterV2()
+        game.set_seed(1)
+        output = []
+        score = game.play(input_fn=lambda prompt: 'quit',
+                          output_fn=lambda *args: output.append(' '.join(str(a) for a in args)))
+        self.assertEqual(score, 0)
+        self.assertTrue(any('Sequence:' in line for line in output))
+
+    def test_perfect_bot_plays_until_max_rounds(self):
+        """Test that an accurate, fast bot clears every round it plays"""
+        level, score = play_one(0, accuracy=1.0, mean_latency=1.0, latency_jitter=0.0, max_rounds=12)
+        self.assertEqual(level, 13)
+        self.assertGreater(score, 0)
+
+    def test_slow_bot_times_out(self):
+        """Test that answers slower than the 20s limit end the game"""
+        level, score = play_one(0, accuracy=1.0, mean_latency=30.0, latency_jitter=0.0)
+        self.assertEqual((level, score), (1, 0))
+
+    def test_zero_accuracy_bot_fails_first_round(self):
+        """Test that a bot that is never right loses on its first answer"""
+        game = SequenceMasterV2()
+        game.set_seed(3)
+        bot = SequenceBot(accuracy=0.0, mean_latency=1.0, latency_jitter=0.0, seed=3).attach(game)
+        score = game.play(input_fn=bot.answer, output_fn=lambda *args: None, clock=bot.clock)
+        self.assertEqual((score, game.level, bot.rounds), (0, 1, 1))
+
+    def test_wrong_answer_frequency_matches_accuracy(self):
+        """Test that answers are wrong (off by one) about (1 - accuracy) of the time"""
+        game = SequenceMasterV2()
+        game.set_seed(5)
+        game.generate_sequence(time_factor=0)
+        bot = SequenceBot(accuracy=0.7, max_rounds=4000, seed=5).attach(game)
+        answers = [int(bot.answer()) for _ in range(4000)]
+        wrong = [a for a in answers if a != game.correct_answer]
+        self.assertAlmostEqual(len(wrong) / len(answers), 0.3, delta=0.03)
+        self.assertTrue(all(abs(a - game.correct_answer) == 1 for a in wrong))
+        self.assertEqual(bot.answer(), 'quit')
+
+    def test_benchmark_report(self):
+        """Test the benchmark summary shape"""
+        report = run_benchmark(games=20, workers=1, chunk_size=7, accuracy=0.8, max_rounds=10)
+        self.assertEqual(report['games'], 20)
+        self.assertEqual(sum(report['level_distribution'].values()), 20)
+        self.assertLessEqual(report['score_distribution']['p50'], report['score_distribution']['max'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,226 @@
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from challengeTokens import issue_token, verify_token, InvalidToken
+from app import app, solve_challenge, solve_stats, BOSS_STATS_MODE, event_log, leaderboard_index
+
+class TestChallengeTokens(unittest.TestCase):
+    def test_round_trip_and_tamper(self):
+        """Test that tokens verify and any change to them is rejected"""
+        token = issue_token('secret', n=5, l=2, m='classic', r=3, t=1)
+        claims = verify_token('secret', token)
+        self.assertEqual((claims['n'], claims['l'], claims['r']), (5, 2, 3))
+
+        payload, tag = token.split('.')
+        forged = issue_token('secret', n=5, l=9, m='classic', r=3, t=1).split('.')[0]
+        for bad in [f"{forged}.{tag}", f"{payload}.{tag[:-2]}AA", 'garbage', None]:
+            with self.assertRaises(InvalidToken):
+                verify_token('secret', bad)
+        with self.assertRaises(InvalidToken):
+            verify_token('other', token)
+
+    def test_expired_token(self):
+        """Test that old tokens are rejected"""
+        token = issue_token('secret', i=0, n=1, l=1, m='classic', r=0, t=0)
+        with self.assertRaises(InvalidToken):
+            verify_token('secret', token, max_age=60)
+
+class TestStatelessAnswers(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.app.testing = True
+
+    def answer_for(self, token):
+        return solve_challenge(verify_token(app.secret_key, token))[0]
+
+    def test_answer_checked_from_token(self):
+        """Test that answers are validated without storing them in the session"""
+        for mode in ['classic', 'daily', 'code_breaker']:
+            self.app.post('/api/mode', json={'mode': mode})
+            data = self.app.get('/api/challenge').get_json()
+            self.assertNotIn('correct_answer', data)
+            with self.app.session_transaction() as sess:
+                self.assertNotIn('correct_answer', sess)
+
+            answer = self.answer_for(data['token'])
+            response = self.app.post('/api/answer', json={'answer': answer, 'token': data['token']})
+            self.assertFalse(response.get_json()['game_over'], mode)
+
+            # The same token cannot be replayed once the level has moved on
+            replay = self.app.post('/api/answer', json={'answer': answer, 'token': data['token']})
+            self.assertEqual(replay.status_code, 400)
+
+    def test_wrong_answer_cannot_be_replayed(self):
+        """Test that a token answered wrongly is retired, even though the answer was revealed"""
+        self.app.post('/api/mode', json={'mode': 'classic'})
+        data = self.app.get('/api/challenge').get_json()
+        answer = self.answer_for(data['token'])
+
+        wrong = self.app.post('/api/answer', json={'answer': answer + 1, 'token': data['token']}).get_json()
+        self.assertTrue(wrong['game_over'])
+        self.assertEqual(wrong['correct_answer'], answer)
+
+        replay = self.app.post('/api/answer', json={'answer': answer, 'token': data['token']})
+        self.assertEqual(replay.status_code, 400)
+
+        # A new game does not bring old tokens back either
+        self.app.post('/api/reset')
+        replay = self.app.post('/api/answer', json={'answer': answer, 'token': data['token']})
+        self.assertEqual(replay.status_code, 400)
+
+    def test_only_latest_challenge_is_answerable(self):
+        """Test that fetching a new challenge retires the previous token"""
+        self.app.post('/api/mode', json={'mode': 'classic'})
+        first = self.app.get('/api/challenge').get_json()['token']
+        self.app.get('/api/challenge')
+        response = self.app.post('/api/answer', json={'answer': self.answer_for(first), 'token': first})
+        self.assertEqual(response.status_code, 400)
+
+    def test_last_answer_only_after_timeout(self):
+        """Test that the answer is revealed only once the mode timer has run out"""
+        self.app.post('/api/mode', json={'mode': 'classic'})
+        token = self.app.get('/api/challenge').get_json()['token']
+        live = self.app.get('/api/last_answer', query_string={'token': token}).get_json()
+        self.assertIsNone(live['last_answer'])
+
+        # Same challenge, issued a minute ago (past the 20s classic timer)
+        claims = verify_token(app.secret_key, token)
+        expired = issue_token(app.secret_key, **{**claims, 'i': claims['i'] - 60000})
+        answer = self.answer_for(expired)
+        revealed = self.app.get('/api/last_answer', query_string={'token': expired}).get_json()
+        self.assertEqual(revealed['last_answer'], answer)
+
+        # Revealing the answer retires the challenge
+        replay = self.app.post('/api/answer', json={'answer': answer, 'token': expired})
+        self.assertEqual(replay.status_code, 400)
+
+    def failures(self, mode):
+        return sum(r['failures'] for r in solve_stats.local.summary() if r['mode'] == mode)
+
+    def test_timeout_recorded_as_failure(self):
+        """Test that a challenge retired by timing out counts as a failed attempt"""
+        self.app.post('/api/mode', json={'mode': 'speed'})
+        token = self.app.get('/api/challenge').get_json()['token']
+        claims = verify_token(app.secret_key, token)
+        expired = issue_token(app.secret_key, **{**claims, 'i': claims['i'] - 60000})
+        before_failures, before_events = self.failures('speed'), event_log.stats()['recorded']
+
+        self.app.get('/api/last_answer', query_string={'token': expired})
+        self.assertEqual(self.failures('speed'), before_failures + 1)
+        self.assertEqual(event_log.stats()['recorded'], before_events + 2)
+
+        # Asking again for a retired challenge records nothing more
+        self.app.get('/api/last_answer', query_string={'token': expired})
+        self.assertEqual(self.failures('speed'), before_failures + 1)
+
+    def test_boss_timeout_reported(self):
+        """Test that a boss timeout ends the battle server-side and counts as a failure"""
+        self.app.post('/api/mode', json={'mode': 'classic'})
+        with self.app.session_transaction() as sess:
+            sess['level'] = 5
+        sequences = self.app.post('/api/boss/start').get_json()['sequences']
+        token = sequences[0]['token']
+
+        early = self.app.post('/api/boss/timeout', json={'token': token})
+        self.assertEqual(early.status_code, 400)
+
+        before = self.failures(BOSS_STATS_MODE)
+        with self.app.session_transaction() as sess:
+            sess['boss_start_time'] -= 31
+        result = self.app.post('/api/boss/timeout', json={'token': token}).get_json()
+        self.assertTrue(result['game_over'])
+        self.assertEqual(result['correct_answer'], self.answer_for(token))
+        self.assertEqual(self.failures(BOSS_STATS_MODE), before + 1)
+
+        late = self.app.post('/api/boss/answer', json={'answer': self.answer_for(token), 'token': token})
+        self.assertEqual(late.status_code, 400)
+
+    def test_debugger_spends_a_charge(self):
+        """Test that the debugger hint is server-side and needs a purchased charge"""
+        self.app.post('/api/mode', json={'mode': 'classic'})
+        token = self.app.get('/api/challenge').get_json()['token']
+        with self.app.session_transaction() as sess:
+            sess['power_ups'] = {'time_freeze': 0, 'debugger': 1, 'skip': 0}
+
+        hint = self.app.post('/api/powerup/debugger', json={'token': token}).get_json()
+        self.assertIn(hint['digit'], str(self.answer_for(token)))
+        self.assertEqual(hint['power_ups']['debugger'], 0)
+
+        response = self.app.post('/api/powerup/debugger', json={'token': token})
+        self.assertEqual(response.status_code, 400)
+
+    def test_events_kept_out_of_real_data(self):
+        """Test that the app under test writes events, stats and scores where conftest points them"""
+        self.assertEqual(event_log.log_dir, os.environ['SEQUENCE_MASTER_EVENTS_DIR'])
+        self.assertEqual(solve_stats.stats_dir, os.environ['SEQUENCE_MASTER_STATS_DIR'])
+        self.assertEqual(leaderboard_index.history_path, os.environ['SEQUENCE_MASTER_SCORE_HISTORY'])
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+        for path in (event_log.log_dir, solve_stats.stats_dir, leaderboard_index.history_path):
+            self.assertFalse(os.path.abspath(path).startswith(data_dir + os.sep), path)
+
+    def test_answer_without_token(self):
+        """Test that answering with no challenge is an error"""
+        response = self.app.post('/api/answer', json={'answer': '3'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_boss_battle_with_tokens(self):
+        """Test a full boss battle using only the issued tokens"""
+        self.app.post('/api/mode', json={'mode': 'classic'})
+        with self.app.session_transaction() as sess:
+            sess['level'] = 5
+        data = self.app.post('/api/boss/start').get_json()
+        self.assertTrue(all('correct_answer' not in s for s in data['sequences']))
+
+        # Answering out of order is rejected
+        out_of_order = data['sequences'][1]['token']
+        response = self.app.post('/api/boss/answer',
+                                 json={'answer': self.answer_for(out_of_order), 'token': out_of_order})
+        self.assertEqual(response.status_code, 400)
+
+        for seq in data['sequences']:
+            result = self.app.post('/api/boss/answer',
+                                   json={'answer': self.answer_for(seq['token']), 'token': seq['token']}).get_json()
+            self.assertTrue(result['correct'])
+        self.assertTrue(result['boss_defeated'])
+        self.assertEqual(result['new_level'], 6)
+
+    def test_boss_answers_timed_per_sequence(self):
+        """Test that each boss answer is timed from the previous one, in its own stats cell"""
+        self.app.post('/api/mode', json={'mode': 'classic'})
+        with self.app.session_transaction() as sess:
+            sess['level'] = 10
+        sequences = self.app.post('/api/boss/start').get_json()['sequences']
+        for i, seq in enumerate(sequences[:2]):
+            if i == 1:
+                with self.app.session_transaction() as sess:
+                    sess['boss_step_time'] -= 7
+            self.app.post('/api/boss/answer',
+                          json={'answer': self.answer_for(seq['token']), 'token': seq['token']})
+
+        rows = [r for r in solve_stats.local.summary()
+                if r['mode'] == BOSS_STATS_MODE and r['level_band'] == '6-10']
+        self.assertEqual(sum(r['solve_time']['count'] for r in rows), 2)
+        # ~0s for the first sequence plus ~7s for the second, not 7s each from the shared issue time
+        total = sum(r['solve_time']['mean'] * r['solve_time']['count'] for r in rows)
+        self.assertAlmostEqual(total, 7, delta=1)
+
+    def test_failed_boss_cannot_be_replayed(self):
+        """Test that a lost boss battle retires all of its tokens"""
+        self.app.post('/api/mode', json={'mode': 'classic'})
+        with self.app.session_transaction() as sess:
+            sess['level'] = 5
+        first = self.app.post('/api/boss/start').get_json()['sequences'][0]['token']
+        answer = self.answer_for(first)
+        result = self.app.post('/api/boss/answer', json={'answer': answer + 1, 'token': first}).get_json()
+        self.assertTrue(result['game_over'])
+
+        with self.app.session_transaction() as sess:
+            sess['boss_current'] = 0
+        replay = self.app.post('/api/boss/answer', json={'answer': answer, 'token': first})
+        self.assertEqual(replay.status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import os
+import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestFrontendAssets(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_service_worker_served_from_root(self):
+        """Test that the service worker is served uncached from the site root with an asset version"""
+        response = self.client.get('/sw.js')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('javascript', response.content_type)
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+        source = response.get_data(as_text=True)
+        self.assertNotIn('__ASSET_VERSION__', source)
+        self.assertRegex(source, r'const ASSET_VERSION = "[0-9a-f]{12}";')
+
+    def test_precached_assets_exist(self):
+        """Test that every precached path is served, since one 404 aborts the worker install"""
+        with open(os.path.join(ROOT, 'static', 'sw.js')) as f:
+            source = f.read()
+        block = re.search(r'OFFLINE_ASSETS = \[(.*?)\];', source, re.S).group(1)
+        paths = re.findall(r'"(/[^"]*)"', block)
+        self.assertIn('/', paths)
+        self.assertIn('/static/funfact.html', paths)
+        # Feature modules are cached when used, not downloaded up front
+        self.assertFalse([p for p in paths if p.startswith('/static/js/')])
+        for path in paths:
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200, path)
+            response.close()
+
+    def test_lazy_modules_exist(self):
+        """Test that every feature module the core script loads is shipped"""
+        with open(os.path.join(ROOT, 'static', 'script.js')) as f:
+            names = set(re.findall(r'loadFeature\("(\w+)"\)', f.read()))
+        self.assertEqual(names, {'leaderboard', 'shop', 'boss', 'battle'})
+        for name in names:
+            self.assertTrue(os.path.isfile(os.path.join(ROOT, 'static', 'js', f'{name}.js')), name)
+
+    def test_power_up_buttons_bound_once(self):
+        """Test that each power-up button gets one click handler, bound in init()"""
+        with open(os.path.join(ROOT, 'static', 'js', 'shop.js')) as f:
+            source = f.read()
+        ui = source[source.index('function updateShopUI'):source.index('export function refresh')]
+        self.assertNotIn('addEventListener', ui)
+        for button in ['use-time-freeze', 'use-debugger', 'use-skip']:
+            self.assertIn(f"getElementById('{button}').querySelector('.count')", ui)
+            self.assertEqual(source.count(f"getElementById('{button}').addEventListener"), 1, button)
+        self.assertIn("'/api/powerup/debugger'", source)
+        self.assertNotIn('/api/last_answer', source)
+
+if __name__ == '__main__':
+    unittest.main()
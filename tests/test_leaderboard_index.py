@@ -0,0 +1,96 @@
+import unittest
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboardIndex import LeaderboardIndex, OrderStatisticTree
+
+class TestOrderStatisticTree(unittest.TestCase):
+    def test_bulk_build_and_insert(self):
+        """Test select/count_less after a bulk build plus inserts"""
+        tree = OrderStatisticTree([(k, str(k)) for k in range(0, 200, 2)])
+        for k in range(1, 200, 2):
+            tree.insert(k, str(k))
+        self.assertEqual(len(tree), 200)
+        self.assertEqual([tree.select(i)[0] for i in range(200)], list(range(200)))
+        self.assertEqual(tree.count_less(50), 50)
+        self.assertEqual(tree.count_less(-1), 0)
+        with self.assertRaises(IndexError):
+            tree.select(200)
+
+class TestLeaderboardIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'score_history.jsonl')
+        self.index = LeaderboardIndex(self.path).load()
+        for name, score, mode in [('ann', 300, 'classic'), ('bob', 500, 'classic'),
+                                  ('cat', 400, 'speed'), ('ann', 100, 'classic'),
+                                  ('dan', 300, 'classic')]:
+            self.index.add(name, score, mode)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_page_and_ranks(self):
+        """Test ranked pages per mode and across all modes"""
+        page = self.index.page('classic', page=1, per_page=3)
+        self.assertEqual(page['total'], 4)
+        self.assertEqual([(e['name'], e['rank']) for e in page['entries']],
+                         [('bob', 1), ('ann', 2), ('dan', 2)])
+        self.assertEqual(self.index.page('all', page=2, per_page=3)['entries'][0]['name'], 'dan')
+        self.assertEqual(self.index.page('zen')['total'], 0)
+
+    def test_rank_lookups(self):
+        """Test rank of a score, of a player's best, and neighbours"""
+        self.assertEqual(self.index.rank_of_score('classic', 300)['rank'], 2)
+        self.assertEqual(self.index.rank_of_score('classic', 1000)['rank'], 1)
+        self.assertEqual(self.index.rank_of_player('classic', 'ann')['rank'], 2)
+        self.assertIsNone(self.index.rank_of_player('speed', 'ann'))
+        around = self.index.around('classic', 'dan', radius=1)
+        self.assertEqual([e['name'] for e in around['entries']], ['ann', 'dan', 'ann'])
+        self.assertEqual([e['rank'] for e in around['entries']], [2, 2, 4])
+
+    def test_ties_ranked_the_same_everywhere(self):
+        """Test that every lookup gives tied scores the same competition rank"""
+        by_score = self.index.rank_of_score('classic', 300)['rank']
+        self.assertEqual(self.index.rank_of_player('classic', 'dan')['rank'], by_score)
+        self.assertEqual(self.index.around('classic', 'dan', radius=0)['rank'], by_score)
+        page = {e['name']: e['rank'] for e in self.index.page('classic')['entries'] if e['score'] == 300}
+        self.assertEqual(set(page.values()), {by_score})
+
+    def test_rebuild_from_history(self):
+        """Test that a fresh index rebuilds the same ordering from disk"""
+        rebuilt = LeaderboardIndex(self.path).load()
+        self.assertEqual(rebuilt.page('all'), self.index.page('all'))
+
+    def test_sees_scores_added_by_other_workers(self):
+        """Test that an index picks up lines another worker appended to the shared history"""
+        other = LeaderboardIndex(self.path).load()
+        other.add('eve', 450, 'classic')
+        self.assertEqual(self.index.rank_of_player('classic', 'eve')['rank'], 2)
+        self.assertEqual(self.index.page('classic')['total'], 5)
+
+        # A half-written line is left alone until it is complete
+        with open(self.path, 'a') as f:
+            f.write('{"name": "fay", "score": 900, "mo')
+        self.assertEqual(self.index.total('classic'), 5)
+        with open(self.path, 'a') as f:
+            f.write('de": "classic", "date": "2025-12-03 10:13"}\n')
+        self.assertEqual(self.index.rank_of_player('classic', 'fay')['rank'], 1)
+        self.assertEqual(self.index.page('all'), other.page('all'))
+
+    def test_bootstrap_from_legacy_leaderboard(self):
+        """Test that a missing history is seeded from the legacy list"""
+        path = os.path.join(self.tmp, 'new', 'history.jsonl')
+        legacy = [{'name': 'kish', 'score': 777, 'mode': 'classic', 'date': '2025-12-03 10:13'}]
+        index = LeaderboardIndex(path).load(bootstrap=legacy)
+        self.assertEqual(index.rank_of_player('classic', 'kish')['rank'], 1)
+        with open(path) as f:
+            self.assertEqual(json.loads(f.readline())['score'], 777)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import os
+import sys
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import memoryStats
+from app import app, solve_challenge
+from challengeTokens import verify_token
+from sequenceMaster import SequenceMasterV2, PATTERN_HISTORY_LIMIT
+
+# Peak bytes allocated per request, as seen by the app's per-request counters.
+# /api/answer includes werkzeug's 64 KiB request-body read buffer.
+CHALLENGE_BUDGET = 24 * 1024
+ANSWER_BUDGET = 96 * 1024
+GENERATE_BUDGET = 16 * 1024
+
+class TestMemoryBudgets(unittest.TestCase):
+    def setUp(self):
+        self.app = app.test_client()
+        self.app.testing = True
+        self.app.post('/api/mode', json={'mode': 'classic'})
+        # Warm up lazy imports and caches so only steady-state allocations count
+        for _ in range(3):
+            self.play_round()
+
+    def play_round(self):
+        data = self.app.get('/api/challenge').get_json()
+        answer = solve_challenge(verify_token(app.secret_key, data['token']))[0]
+        self.app.post('/api/answer', json={'answer': answer, 'token': data['token']})
+        self.app.post('/api/reset')
+        return data
+
+    def traced_requests(self, rounds=5):
+        """Play a few rounds with tracing on and return the per-endpoint counters"""
+        memoryStats.start()
+        try:
+            memoryStats.request_allocations.reset()
+            for _ in range(rounds):
+                self.play_round()
+            return memoryStats.request_allocations.snapshot()
+        finally:
+            memoryStats.stop()
+
+    def test_hot_path_budgets(self):
+        """Test that /api/challenge and /api/answer stay within their allocation budgets"""
+        counters = self.traced_requests()
+        self.assertEqual(counters['get_challenge']['requests'], 5)
+        self.assertLess(counters['get_challenge']['peak_max'], CHALLENGE_BUDGET)
+        self.assertLess(counters['check_answer']['peak_max'], ANSWER_BUDGET)
+
+    def test_generate_sequence_budget(self):
+        """Test that generating a cached puzzle is cheap"""
+        game = SequenceMasterV2()
+        game.set_seed(11)
+        game.generate_sequence(time_factor=0)
+        with memoryStats.measure() as used:
+            game.generate_sequence(time_factor=0)
+        self.assertLess(used['peak'], GENERATE_BUDGET)
+
+    def test_pattern_history_is_bounded(self):
+        """Test that a long-lived game does not accumulate history"""
+        game = SequenceMasterV2()
+        for level in range(1, 200):
+            game.level = level
+            game.generate_sequence(time_factor=0)
+        self.assertEqual(len(game.pattern_history), PATTERN_HISTORY_LIMIT)
+
+    def test_tracing_alone_does_not_enable_debug_endpoint(self):
+        """Test that tracing started outside memoryStats.start() is not an opt-in"""
+        tracemalloc.start()
+        try:
+            self.assertFalse(memoryStats.enabled())
+            self.assertEqual(self.app.get('/api/debug/memory').status_code, 404)
+        finally:
+            tracemalloc.stop()
+
+    def test_request_counters_and_debug_endpoint(self):
+        """Test per-endpoint counters and the debug report when tracing is on"""
+        self.assertEqual(self.app.get('/api/debug/memory').status_code, 404)
+        memoryStats.start()
+        try:
+            memoryStats.request_allocations.reset()
+            self.play_round()
+            report = self.app.get('/api/debug/memory').get_json()
+            self.assertEqual(report['requests']['get_challenge']['requests'], 1)
+            self.assertEqual(report['requests']['check_answer']['requests'], 1)
+            self.assertTrue(report['top_sites']['modules'])
+        finally:
+            memoryStats.stop()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sequenceMaster import SequenceMasterV2, build_puzzle, puzzle_cache_stats
+
+class TestPuzzleGeneration(unittest.TestCase):
+    def setUp(self):
+        build_puzzle.cache_clear()
+
+    def test_build_puzzle_is_deterministic(self):
+        """Test that every rule gives the same puzzle for the same inputs"""
+        for rule_set in range(8):
+            for time_factor in range(5):
+                first = build_puzzle(1234, 3, rule_set, time_factor)
+                build_puzzle.cache_clear()
+                second = build_puzzle(1234, 3, rule_set, time_factor)
+                self.assertEqual(first, second)
+                self.assertEqual(len(first[0]), 6)
+                self.assertEqual(first[1], first[0][-1])
+
+    def test_seeded_game_is_reproducible(self):
+        """Test that a seeded game with an explicit time factor is reproducible"""
+        games = []
+        for _ in range(2):
+            game = SequenceMasterV2()
+            game.set_seed(42)
+            game.level = 4
+            game.generate_sequence(time_factor=2)
+            games.append(game)
+        a, b = games
+        self.assertEqual(a.sequence, b.sequence)
+        self.assertEqual(a.correct_answer, b.correct_answer)
+        self.assertEqual(a.rule_set, b.rule_set)
+        self.assertEqual(a.sequence[-1], '?')
+
+    def test_cache_hits_are_counted(self):
+        """Test that repeated inputs are served from the cache"""
+        for _ in range(3):
+            game = SequenceMasterV2()
+            game.set_seed(7)
+            game.generate_sequence(time_factor=0)
+        stats = puzzle_cache_stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 2)
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3, places=3)
+
+    def test_cached_result_is_not_mutated(self):
+        """Test that blanking the answer does not leak into the cache"""
+        game = SequenceMasterV2()
+        game.set_seed(9)
+        game.generate_sequence(time_factor=1)
+        sequence, answer, _ = build_puzzle(9, 1, game.rule_set, 1)
+        self.assertEqual(sequence[-1], answer)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solveStats import QuantileSketch, SolveStats, WorkerSolveStats, level_band
+
+class TestQuantileSketch(unittest.TestCase):
+    def test_quantiles_within_relative_accuracy(self):
+        """Test sketch quantiles against exact quantiles"""
+        rng = random.Random(3)
+        values = sorted(rng.lognormvariate(1.5, 0.8) for _ in range(5000))
+        sketch = QuantileSketch(relative_accuracy=0.02)
+        for v in values:
+            sketch.add(v)
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            self.assertAlmostEqual(sketch.quantile(q), exact, delta=exact * 0.021)
+
+    def test_merge_matches_single_sketch(self):
+        """Test that merging partial sketches equals sketching everything at once"""
+        values = [0.0005, 1.2, 3.4, 3.5, 8.0, 19.9, 2.2, 0.7]
+        whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for i, v in enumerate(values):
+            whole.add(v)
+            (left if i % 2 else right).add(v)
+        left.merge(right)
+        self.assertEqual(left.buckets, whole.buckets)
+        self.assertEqual((left.zero_count, left.count, left.min, left.max),
+                         (whole.zero_count, whole.count, whole.min, whole.max))
+        self.assertEqual(QuantileSketch.from_dict(whole.to_dict()).buckets, whole.buckets)
+        self.assertEqual(left.quantile(0.5), whole.quantile(0.5))
+
+class TestSolveStats(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_level_bands(self):
+        self.assertEqual(level_band(1), '1-5')
+        self.assertEqual(level_band(5), '1-5')
+        self.assertEqual(level_band(6), '6-10')
+
+    def test_summary_counts_failures(self):
+        """Test failure rate and solve-time counts per cell"""
+        stats = SolveStats()
+        for t in (2.0, 4.0, 6.0):
+            stats.record(3, 2, 'classic', t, True)
+        stats.record(3, 4, 'classic', 1.0, False)
+        row, = stats.summary({'3': 'Fibonacci Twist'})
+        self.assertEqual((row['rule_name'], row['level_band']), ('Fibonacci Twist', '1-5'))
+        self.assertEqual((row['attempts'], row['failures'], row['failure_rate']), (4, 1, 0.25))
+        self.assertEqual(row['solve_time']['count'], 3)
+        self.assertEqual(row['solve_time']['mean'], 4.0)
+
+    def test_workers_merge_through_snapshots(self):
+        """Test that one worker's global view includes another worker's snapshot"""
+        a = WorkerSolveStats(stats_dir=self.tmp, cache_ttl=0)
+        b = WorkerSolveStats(stats_dir=self.tmp, cache_ttl=0)
+        b.snapshot_path = os.path.join(self.tmp, 'solve-stats-other.json')
+        a.record('color', 1, 'code_breaker', 3.0, True)
+        b.record('color', 2, 'code_breaker', 5.0, False)
+        b.flush()
+        row, = a.global_summary()['rules']
+        self.assertEqual((row['attempts'], row['failures']), (2, 1))
+
+    def test_stale_snapshots_compacted(self):
+        """Test that a dead worker's snapshot is folded into a live worker and removed"""
+        live = WorkerSolveStats(stats_dir=self.tmp, cache_ttl=0, stale_after=60)
+        dead = WorkerSolveStats(stats_dir=self.tmp, cache_ttl=0)
+        dead.snapshot_path = os.path.join(self.tmp, 'solve-stats-dead.json')
+        other = WorkerSolveStats(stats_dir=self.tmp, cache_ttl=0)
+        other.snapshot_path = os.path.join(self.tmp, 'solve-stats-other.json')
+        live.record(1, 1, 'classic', 2.0, True)
+        dead.record(1, 1, 'classic', 4.0, True)
+        other.record(1, 1, 'classic', 6.0, False)
+        dead.flush()
+        other.flush()
+        old = os.path.getmtime(dead.snapshot_path) - 120
+        os.utime(dead.snapshot_path, (old, old))
+
+        self.assertEqual(live.compact(), 1)
+        self.assertEqual(sorted(os.listdir(self.tmp)),
+                         sorted([os.path.basename(live.snapshot_path), 'solve-stats-other.json']))
+        row, = live.global_summary()['rules']
+        self.assertEqual((row['attempts'], row['failures']), (3, 1))
+
+        # A refreshed snapshot is not stale, even with nothing new to write
+        os.utime(other.snapshot_path, (old, old))
+        other.flush()
+        self.assertEqual(live.compact(), 0)
+
+    def test_global_summary_is_cached(self):
+        """Test that the merged view is reused within the cache TTL"""
+        worker = WorkerSolveStats(stats_dir=self.tmp, cache_ttl=60)
+        first = worker.global_summary()
+        worker.record(0, 1, 'classic', 1.0, True)
+        self.assertIs(worker.global_summary(), first)
+
+if __name__ == '__main__':
+    unittest.main()